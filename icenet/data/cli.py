@@ -172,11 +172,27 @@ def process_args(dates: bool = True,
 
     ap.add_argument("-l", "--lag", type=int, default=2)
     ap.add_argument("-f", "--forecast", type=int, default=93)
+    ap.add_argument("--pack",
+                    help="Comma separated list of vars to store as packed "
+                    "int16 rather than float",
+                    type=csv_arg,
+                    default=[],
+                    dest="packed_vars")
     ap.add_argument("-po",
                     "--parallel-opens",
                     default=False,
                     action="store_true",
                     help="Allow xarray mfdataset to work with parallel opens")
+    ap.add_argument("-w",
+                    "--workers",
+                    default=1,
+                    type=int,
+                    help="Number of variables to process concurrently")
+    ap.add_argument("--skip-unchanged",
+                    default=False,
+                    action="store_true",
+                    help="Reuse processed variables whose source files and "
+                    "configuration are unchanged since the last run")
 
     ap.add_argument("--abs",
                     help="Comma separated list of abs vars",
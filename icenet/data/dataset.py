@@ -58,6 +58,8 @@ class IceNetDataSet(SplittingMixin, DataCollection):
                  batch_size: int = 4,
                  path: str = os.path.join(".", "network_datasets"),
                  shuffling: bool = False,
+                 shuffle_buffer: int = None,
+                 shuffle_cycle_length: int = None,
                  **kwargs) -> None:
         """Initialises an instance of the IceNetDataSet class.
 
@@ -69,6 +71,11 @@ class IceNetDataSet(SplittingMixin, DataCollection):
                 protocol buffer files will be stored. Defaults to './network_datasets'.
             shuffling (optional): Flag indicating whether to shuffle the data.
                 Defaults to False.
+            shuffle_buffer (optional): Number of training records to mix when
+                shuffling. Defaults to None, for the batch size per training
+                file up to a maximum of 366.
+            shuffle_cycle_length (optional): Number of training files to
+                interleave when shuffling. Defaults to None, for the batch size.
             *args: Additional keyword arguments.
         """
 
@@ -92,6 +99,9 @@ class IceNetDataSet(SplittingMixin, DataCollection):
         self._num_channels = self._config["num_channels"]
         self._shape = tuple(self._config["shape"])
         self._shuffling = shuffling
+        self._shuffle_buffer = shuffle_buffer
+        self._shuffle_cycle_length = shuffle_cycle_length
+        self._storage_dtype = self._config.get("storage_dtype", None)
 
         if "loader_path" in self._config:
             logging.warning("Configuration uses old \"loader_path\" attribute, "
@@ -188,6 +198,9 @@ class MergedIceNetDataSet(SplittingMixin, DataCollection):
     :param configuration_paths: List of configurations to load
     :param batch_size:
     :param path:
+    :param shuffling:
+    :param shuffle_buffer:
+    :param shuffle_cycle_length:
     """
 
     def __init__(self,
@@ -196,6 +209,8 @@ class MergedIceNetDataSet(SplittingMixin, DataCollection):
                  batch_size: int = 4,
                  path: str = os.path.join(".", "network_datasets"),
                  shuffling: bool = False,
+                 shuffle_buffer: int = None,
+                 shuffle_cycle_length: int = None,
                  **kwargs):
         self._config = dict()
         self._configuration_paths = [configuration_paths] \
@@ -219,6 +234,9 @@ class MergedIceNetDataSet(SplittingMixin, DataCollection):
         self._n_forecast_days = self._config["n_forecast_days"]
         self._shape = self._config["shape"]
         self._shuffling = shuffling
+        self._shuffle_buffer = shuffle_buffer
+        self._shuffle_cycle_length = shuffle_cycle_length
+        self._storage_dtype = self._config["storage_dtype"]
 
         self._init_records()
 
@@ -299,6 +317,14 @@ class MergedIceNetDataSet(SplittingMixin, DataCollection):
                 assert self._config[attr] == other[attr], \
                     "{} is not the same across configurations".format(attr)
 
+        # Older configurations predate reduced precision storage
+        storage_dtype = other.get("storage_dtype", None)
+        if "storage_dtype" not in self._config:
+            self._config["storage_dtype"] = storage_dtype
+        else:
+            assert self._config["storage_dtype"] == storage_dtype, \
+                "storage_dtype is not the same across configurations"
+
         self._config["north"] = True if loader.north else self._config["north"]
         self._config["south"] = True if loader.south else self._config["south"]
 
@@ -362,6 +388,9 @@ if pytorch_available:
             self._mode = mode
 
             self._dates = self._dl._config["sources"]["osisaf"]["dates"][self._mode]
+            # Parsed once here rather than for every item requested
+            self._timestamps = pd.DatetimeIndex(
+                [date.replace('_', '-') for date in self._dates])
 
         def __len__(self):
             return self._counts[self._mode]
@@ -371,7 +400,7 @@ if pytorch_available:
             """
             with dask.config.set(scheduler="synchronous"):
                 sample = self._dl.generate_sample(
-                    date=pd.Timestamp(self._dates[idx].replace('_', '-')),
+                    date=self._timestamps[idx],
                     parallel=False,
                 )
             return sample
@@ -10,7 +10,8 @@ def get_decoder(shape: object,
                 channels: object,
                 forecasts: object,
                 num_vars: int = 1,
-                dtype: str = "float32") -> object:
+                dtype: str = "float32",
+                storage_dtype: str = None) -> object:
     """Returns a decoder function used for parsing and decoding data from tfrecord protocol buffer.
 
     Args:
@@ -19,16 +20,32 @@ def get_decoder(shape: object,
         forecasts: The number of days to forecast in prediction
         num_vars (optional): The number of variables in the input data. Defaults to 1.
         dtype (optional): The data type of the input data. Defaults to "float32".
+        storage_dtype (optional): The data type the records were stored as raw
+            bytes in, which is cast to `dtype` when decoded. Defaults to None,
+            for records stored as float lists.
 
     Returns:
         A function that can be used to parse and decode data. It takes in a protocol buffer
             (tfrecord) as input and returns the parsed and decoded data.
     """
-    xf = tf.io.FixedLenFeature([*shape, channels], getattr(tf, dtype))
-    yf = tf.io.FixedLenFeature([*shape, forecasts, num_vars],
-                               getattr(tf, dtype))
-    sf = tf.io.FixedLenFeature([*shape, forecasts, num_vars],
-                               getattr(tf, dtype))
+    x_shape = [*shape, channels]
+    y_shape = [*shape, forecasts, num_vars]
+
+    if storage_dtype is not None:
+        xf = tf.io.FixedLenFeature([], tf.string)
+        yf = tf.io.FixedLenFeature([], tf.string)
+        sf = tf.io.FixedLenFeature([], tf.string)
+    else:
+        xf = tf.io.FixedLenFeature(x_shape, getattr(tf, dtype))
+        yf = tf.io.FixedLenFeature(y_shape, getattr(tf, dtype))
+        sf = tf.io.FixedLenFeature(y_shape, getattr(tf, dtype))
+
+    def decode_raw(raw, item_shape):
+        # Leading dimensions of the raw bytes match those of the protos, so
+        # this handles both single and batched records
+        arr = tf.io.decode_raw(raw, getattr(tf, storage_dtype))
+        arr = tf.reshape(arr, tf.concat([tf.shape(raw), item_shape], axis=0))
+        return tf.cast(arr, getattr(tf, dtype))
 
     @tf.function
     def decode_item(proto):
@@ -39,6 +56,11 @@ def get_decoder(shape: object,
         }
 
         item = tf.io.parse_example(proto, features)
+
+        if storage_dtype is not None:
+            return decode_raw(item['x'], x_shape), \
+                decode_raw(item['y'], y_shape), \
+                decode_raw(item['sample_weights'], y_shape)
         return item['x'], item['y'], item['sample_weights']
 
     return decode_item
@@ -66,6 +88,9 @@ class SplittingMixin:
     _n_forecast_days: int
     _shape: int
     _shuffling: bool
+    _storage_dtype: str = None
+    _shuffle_buffer: int = None
+    _shuffle_cycle_length: int = None
 
     train_fns = []
     test_fns = []
@@ -160,28 +185,40 @@ class SplittingMixin:
         decoder = get_decoder(self.shape,
                               self.num_channels,
                               self.n_forecast_days,
-                              dtype=self.dtype.__name__)
-
-        if self.shuffling:
-            logging.info("Training dataset(s) marked to be shuffled")
-            # FIXME: this is not a good calculation, but we don't have access
-            #  in the mixin to the configuration that generated the dataset #57
-            train_ds = train_ds.shuffle(
-                min(int(len(self.train_fns) * self.batch_size), 366))
+                              dtype=self.dtype.__name__,
+                              storage_dtype=self.storage_dtype)
+
+        if self.shuffling and len(self.train_fns) > 0:
+            logging.info("Training dataset(s) marked to be shuffled, "
+                         "interleaving {} files with a {} record buffer".format(
+                             self.shuffle_cycle_length, self.shuffle_buffer))
+            # Shuffle in blocks: each file holds a run of contiguous forecast
+            # dates, so the file order is reshuffled every epoch and records
+            # are interleaved from several files at once. Reads stay
+            # sequential within files, and the record shuffle mixes the
+            # interleaved blocks rather than buffering a large part of the set
+            train_ds = tf.data.Dataset.from_tensor_slices(self.train_fns).\
+                shuffle(len(self.train_fns), reshuffle_each_iteration=True).\
+                interleave(tf.data.TFRecordDataset,
+                           cycle_length=self.shuffle_cycle_length,
+                           num_parallel_calls=self.shuffle_cycle_length).\
+                shuffle(self.shuffle_buffer)
 
         # Since TFRecordDataset does not parse or decode the dataset from bytes,
-        # use custom decoder function with map to do so.
+        # use custom decoder function with map to do so. Records are batched
+        # first so that each batch is parsed by a single vectorised
+        # parse_example call, rather than one call per record
         train_ds = train_ds.\
-            map(decoder, num_parallel_calls=self.batch_size).\
-            batch(self.batch_size)
+            batch(self.batch_size).\
+            map(decoder, num_parallel_calls=tf.data.AUTOTUNE)
 
         val_ds = val_ds.\
-            map(decoder, num_parallel_calls=self.batch_size).\
-            batch(self.batch_size)
+            batch(self.batch_size).\
+            map(decoder, num_parallel_calls=tf.data.AUTOTUNE)
 
         test_ds = test_ds.\
-            map(decoder, num_parallel_calls=self.batch_size).\
-            batch(self.batch_size)
+            batch(self.batch_size).\
+            map(decoder, num_parallel_calls=tf.data.AUTOTUNE)
 
         return train_ds.prefetch(tf.data.AUTOTUNE), \
             val_ds.prefetch(tf.data.AUTOTUNE), \
@@ -200,7 +237,8 @@ class SplittingMixin:
         decoder = get_decoder(self.shape,
                               self.num_channels,
                               self.n_forecast_days,
-                              dtype=self.dtype.__name__)
+                              dtype=self.dtype.__name__,
+                              storage_dtype=self.storage_dtype)
 
         for df in getattr(self, "{}_fns".format(split)):
             logging.debug("Getting records from {}".format(df))
@@ -274,3 +312,24 @@ class SplittingMixin:
     def shuffling(self) -> bool:
         """A flag for whether training dataset(s) are marked to be shuffled."""
         return self._shuffling
+
+    @property
+    def shuffle_buffer(self) -> int:
+        """The number of records mixed by the training shuffle buffer.
+
+        Defaults to the batch size per training file, capped at a year of
+        daily records.
+        """
+        if self._shuffle_buffer:
+            return self._shuffle_buffer
+        return min(len(self.train_fns) * self.batch_size, 366)
+
+    @property
+    def shuffle_cycle_length(self) -> int:
+        """The number of training files interleaved when shuffling."""
+        return self._shuffle_cycle_length or self.batch_size
+
+    @property
+    def storage_dtype(self) -> str:
+        """The reduced precision data type records are stored in, if any."""
+        return self._storage_dtype
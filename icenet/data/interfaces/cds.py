@@ -1,4 +1,3 @@
-import datetime as dt
 import logging
 import os
 import requests
@@ -208,29 +207,29 @@ class ERA5Downloader(ClimateDownloader):
         nom = list(ds.data_vars)[0]
         da = getattr(ds.rename({nom: var}), var)
 
-        doy_counts = da.time.groupby("time.dayofyear").count()
+        doys, doy_counts = np.unique(da.time.dt.dayofyear.values,
+                                     return_counts=True)
+        partial_doys = doys[doy_counts < 24]
 
         # There are situations where the API will spit out unordered and
         # partial data, so we ensure here means come from full days and don't
         # leave gaps. If we can avoid expver with this, might as well, so
         # that's second
         # FIXME: This will cause issues for already processed latlon data
-        if len(doy_counts[doy_counts < 24]) > 0:
-            strip_dates_before = min([
-                dt.datetime.strptime(
-                    "{}-{}".format(d,
-                                   pd.to_datetime(da.time.values[0]).year),
-                    "%j-%Y")
-                for d in doy_counts[doy_counts < 24].dayofyear.values
-            ])
-            da = da.where(da.time < pd.Timestamp(strip_dates_before), drop=True)
+        if len(partial_doys) > 0:
+            strip_dates_before = \
+                pd.Timestamp(pd.to_datetime(da.time.values[0]).year, 1, 1) + \
+                pd.Timedelta(days=int(partial_doys.min()) - 1)
+            da = da.sel(time=da.time < strip_dates_before)
 
         if 'expver' in da.coords:
             logging.warning("expvers {} in coordinates, will process out but "
                             "this needs further work: expver needs storing for "
                             "later overwriting".format(da.expver))
             # Ref: https://confluence.ecmwf.int/pages/viewpage.action?pageId=173385064
-            da = da.sel(expver=1).combine_first(da.sel(expver=5))
+            # Both expvers come from the same file and share their indexes,
+            # so fill the ERA5T gaps directly without an outer alignment
+            da = da.sel(expver=1).fillna(da.sel(expver=5))
 
         da = da.sortby("time").resample(time='1D').mean()
         da.to_netcdf(download_path)
@@ -4,6 +4,7 @@ import os
 import re
 import shutil
 import tempfile
+import time
 
 from abc import abstractmethod
 from concurrent.futures import ThreadPoolExecutor
@@ -30,13 +31,16 @@ import xarray as xr
 
 """
 
+WIND_FILE_DATE_RE = re.compile(r'^(?:\w+_)?(\d+).nc')
+
 
 def filter_dates_on_data(latlon_path: str,
                          regridded_name: str,
                          req_dates: object,
                          check_latlon: bool = True,
                          check_regridded: bool = True,
-                         drop_vars: list = None):
+                         drop_vars: list = None,
+                         exists: object = os.path.exists):
     """Reduces request dates and target files based on existing data
 
     To avoid what is potentially significant resource expense downloading
@@ -52,6 +56,8 @@ def filter_dates_on_data(latlon_path: str,
     :param check_latlon:
     :param check_regridded:
     :param drop_vars:
+    :param exists: callable checking whether a file exists, so callers can
+        answer from a directory listing they already hold
     :return: req_dates(list)
     """
 
@@ -61,7 +67,7 @@ def filter_dates_on_data(latlon_path: str,
 
     # Latlon files should in theory be aggregated and singular arrays
     # meaning we can naively open and interrogate the dates
-    if check_latlon and os.path.exists(latlon_path):
+    if check_latlon and exists(latlon_path):
         try:
             latlon_dates = xr.open_dataset(latlon_path,
                                            drop_variables=drop_vars).time.values
@@ -70,7 +76,7 @@ def filter_dates_on_data(latlon_path: str,
         except ValueError:
             logging.warning("Latlon {} dates not readable, ignoring file")
 
-    if check_regridded and os.path.exists(regridded_name):
+    if check_regridded and exists(regridded_name):
         regridded_dates = xr.open_dataset(regridded_name,
                                           drop_variables=drop_vars).time.values
         logging.debug("{} regridded dates already available in {}".format(
@@ -160,6 +166,7 @@ class ClimateDownloader(Downloader):
         self._max_threads = max_threads
         self._postprocess = postprocess
         self._pregrid_prefix = pregrid_prefix
+        self._preflight = dict()
         self._rotatable_files = []
         self._sic_ease_cubes = dict()
         self._var_name_idx = var_name_idx
@@ -211,25 +218,104 @@ class ClimateDownloader(Downloader):
                     product([var_name], levels, dates_per_request):
                 requests.append((var_prefix, level, req_date))
 
+        self._preflight = self._plan(requests)
+        exec_times = []
+
         with ThreadPoolExecutor(max_workers=min(len(requests),
                                                 self._max_threads)) \
                 as executor:
-            futures = []
+            futures = dict()
 
             for var_prefix, level, req_date in requests:
-                future = executor.submit(self._single_download, var_prefix,
-                                         level, req_date)
-                futures.append(future)
+                future = executor.submit(self._timed_single_download,
+                                         var_prefix, level, req_date)
+                futures[future] = (var_prefix, level, req_date)
 
             for future in concurrent.futures.as_completed(futures):
+                var_prefix, level, req_date = futures[future]
+
                 try:
-                    future.result()
+                    exec_times.append(future.result())
+                    logging.info("Download for {} @ {} with {} dates took "
+                                 "{:.1f}s".format(var_prefix, level,
+                                                  len(req_date),
+                                                  exec_times[-1]))
                 except Exception as e:
                     logging.exception("Thread failure: {}".format(e))
 
+        if len(exec_times) > 0:
+            logging.info("Average download time with {} threads: "
+                         "{:.1f}s".format(self._max_threads,
+                                          np.average(exec_times)))
+
+        self._preflight = dict()
+
         logging.info("{} daily files downloaded".format(
             len(self._files_downloaded)))
 
+    def _plan(self, requests: object) -> dict:
+        """Lists the existing contents of each requested variable folder
+
+        A single scandir per folder replaces a stat for every candidate file
+        in every request, which matters on network filesystems. Each request
+        owns its own output files, so the listing remains valid for the
+        duration of the download.
+
+        :param requests: list of (var_prefix, level, req_dates) tuples
+        :return: dict of folder path to set of file names
+        """
+        existing = dict()
+
+        for var_prefix, level, _ in requests:
+            var = var_prefix if not level else \
+                "{}{}".format(var_prefix, level)
+            var_folder = self.get_data_var_folder(var)
+
+            if var_folder not in existing:
+                with os.scandir(var_folder) as entries:
+                    existing[var_folder] = {entry.name for entry in entries}
+
+        logging.debug("Preflight listed {} folders".format(len(existing)))
+        return existing
+
+    def _planned_exists(self, path: str) -> bool:
+        """Checks for a file against the preflight listing, if there is one
+
+        :param path: the file to check
+        :return: whether the file exists
+        """
+        folder, filename = os.path.split(path)
+
+        if folder in self._preflight:
+            return filename in self._preflight[folder]
+        return os.path.exists(path)
+
+    def _record_planned(self, path: str):
+        """Adds a file written during the download to the preflight listing
+
+        This keeps the listing current, so later checks can keep answering
+        from it rather than going back to the filesystem.
+
+        :param path: the file written
+        """
+        folder, filename = os.path.split(path)
+
+        if folder in self._preflight:
+            self._preflight[folder].add(filename)
+
+    def _timed_single_download(self, var_prefix: str, level: object,
+                               req_dates: object) -> float:
+        """Runs _single_download, returning the time it took
+
+        :param var_prefix: the icenet variable name
+        :param level: the height to download
+        :param req_dates: the request date
+        :return: execution time in seconds
+        """
+        start = time.time()
+        self._single_download(var_prefix, level, req_dates)
+        return time.time() - start
+
     def _single_download(self, var_prefix: str, level: object,
                          req_dates: object):
         """Implements a single download based on configured download_method
@@ -253,10 +339,12 @@ class ClimateDownloader(Downloader):
         latlon_path, regridded_name = \
             self.get_req_filenames(var_folder, req_dates[0])
 
-        req_dates = filter_dates_on_data(latlon_path,
-                                         regridded_name,
-                                         req_dates,
-                                         drop_vars=self._drop_vars)
+        req_dates = filter_dates_on_data(
+            latlon_path,
+            regridded_name,
+            req_dates,
+            drop_vars=self._drop_vars,
+            exists=self._planned_exists)
 
         if len(req_dates):
             if self._download:
@@ -267,7 +355,7 @@ class ClimateDownloader(Downloader):
 
                     self.download_method(var, level, req_dates, tmp_latlon_path)
 
-                    if os.path.exists(latlon_path):
+                    if self._planned_exists(latlon_path):
                         (ll_path, ll_file) = os.path.split(latlon_path)
                         rename_latlon_path = os.path.join(
                             ll_path,
@@ -290,6 +378,7 @@ class ClimateDownloader(Downloader):
                         os.unlink(rename_latlon_path)
                     else:
                         shutil.move(tmp_latlon_path, latlon_path)
+                        self._record_planned(latlon_path)
 
                 logging.info("Downloaded to {}".format(latlon_path))
             else:
@@ -298,10 +387,12 @@ class ClimateDownloader(Downloader):
         else:
             logging.info("No requested dates remain, likely already present")
 
-        if self._postprocess and os.path.exists(latlon_path):
-            self.postprocess(var, latlon_path)
+        # Postprocessing rewrites the file in place, so a single check covers
+        # both steps
+        if self._planned_exists(latlon_path):
+            if self._postprocess:
+                self.postprocess(var, latlon_path)
 
-        if os.path.exists(latlon_path):
             self._files_downloaded.append(latlon_path)
 
     def postprocess(self, var, download_path):
@@ -326,11 +417,30 @@ class ClimateDownloader(Downloader):
                                        req_date,
                                        date_format=date_format)
 
-            logging.info("Retrieving and saving {}".format(latlon_path))
-            dt_da.compute()
-            dt_da.to_netcdf(latlon_path)
+            # Chunk on disk by time slab, full spatial extent, as regridding
+            # and processing consume whole fields. The dask graph is streamed
+            # straight into the file rather than materialised beforehand, via
+            # h5netcdf which releases the GIL whilst chunks are written
+            chunksizes = tuple(
+                min(30, size) if dim == "time" else size
+                for dim, size in zip(dt_da.dims, dt_da.shape))
+
+            # Match dask chunks to the on-disk chunks, so every write covers
+            # whole compressed HDF5 chunks and memory is bounded by one of them
+            if dt_da.chunks is not None:
+                dt_da = dt_da.chunk(dict(zip(dt_da.dims, chunksizes)))
 
-            if not os.path.exists(regridded_name):
+            logging.info("Retrieving and saving {}".format(latlon_path))
+            dt_da.to_netcdf(latlon_path,
+                            engine="h5netcdf",
+                            encoding={
+                                dt_da.name: dict(chunksizes=chunksizes,
+                                                 zlib=True,
+                                                 complevel=1)
+                            } if dt_da.name else None)
+            self._record_planned(latlon_path)
+
+            if not self._planned_exists(regridded_name):
                 self._files_downloaded.append(latlon_path)
 
     @property
@@ -418,8 +528,9 @@ class ClimateDownloader(Downloader):
         for datafile in files:
             (datafile_path, datafile_name) = os.path.split(datafile)
 
-            new_filename = re.sub(r'^{}'.format(self.pregrid_prefix), '',
-                                  datafile_name)
+            new_filename = datafile_name[len(self.pregrid_prefix):] \
+                if datafile_name.startswith(self.pregrid_prefix) \
+                else datafile_name
             new_datafile = os.path.join(datafile_path, new_filename)
 
             moved_datafile = None
@@ -509,13 +620,13 @@ class ClimateDownloader(Downloader):
 
             latlon_files = [df for df in file_source if source in df]
             wind_files[var] = sorted([
-                re.sub(r'{}'.format(self.pregrid_prefix), '', df)
+                df.replace(self.pregrid_prefix, '')
                 for df in latlon_files
                 if os.path.dirname(df).split(os.sep)[self._var_name_idx] == var
             ],
                                      key=lambda x: int(
-                                         re.search(r'^(?:\w+_)?(\d+).nc',
-                                                   os.path.basename(x)).group(1)
+                                         WIND_FILE_DATE_RE.search(
+                                             os.path.basename(x)).group(1)
                                      ))
             logging.info("{} files for {}".format(len(wind_files[var]), var))
 
@@ -527,8 +638,10 @@ class ClimateDownloader(Downloader):
         for idx, wind_file_0 in enumerate(wind_files[apply_to[0]]):
             wind_file_1 = wind_files[apply_to[1]][idx]
 
-            wd0 = re.sub(r'^{}_'.format(apply_to[0]), '',
-                         os.path.basename(wind_file_0))
+            wd0 = os.path.basename(wind_file_0)
+            wd0_prefix = "{}_".format(apply_to[0])
+            if wd0.startswith(wd0_prefix):
+                wd0 = wd0[len(wd0_prefix):]
 
             if not wind_file_1.endswith(wd0):
                 logging.error("Wind file array is not valid: {}".format(
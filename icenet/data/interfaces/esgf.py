@@ -1,9 +1,18 @@
+import concurrent
+import hashlib
+import json
 import logging
 import os
+import tempfile
+import time
+import types
 import warnings
 
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pandas as pd
+import requests
 import xarray as xr
 
 from icenet.data.interfaces.downloader import ClimateDownloader
@@ -29,6 +38,12 @@ class CMIP6Downloader(ClimateDownloader):
     :param grid_map:
     :param grid_override:
     :param exclude_nodes:
+    :param node_workers: number of concurrent node queries, shared by all
+        experiments and variables of this downloader
+    :param cache_path: directory in which to cache ESGF search results
+    :param cache_ttl: seconds for which cached search results remain valid
+    :param no_cache: do not read or write cached search results
+    :param query_retries: number of attempts for each ESGF search
 
     "MRI-ESM2-0", "r1i1p1f1", None
     "MRI-ESM2-0", "r2i1p1f1", None
@@ -43,7 +58,7 @@ class CMIP6Downloader(ClimateDownloader):
 
     """
 
-    TABLE_MAP = {
+    TABLE_MAP = types.MappingProxyType({
         'siconca': 'SIday',
         'tas': 'day',
         'ta': 'day',
@@ -57,9 +72,9 @@ class CMIP6Downloader(ClimateDownloader):
         'uas': 'day',
         'vas': 'day',
         'ua': 'day',
-    }
+    })
 
-    GRID_MAP = {
+    GRID_MAP = types.MappingProxyType({
         'siconca': 'gn',
         'tas': 'gn',
         'ta': 'gn',
@@ -73,11 +88,13 @@ class CMIP6Downloader(ClimateDownloader):
         'uas': 'gn',
         'vas': 'gn',
         'ua': 'gn',
-    }
+    })
 
     # Prioritise European first, US last, avoiding unnecessary queries
     # against nodes further afield (all traffic has a cost, and the coverage
     # of local nodes is more than enough)
+    NODE_WORKERS = 2
+
     ESGF_NODES = (
         "esgf.ceda.ac.uk",
         "esg1.umr-cnrm.fr",
@@ -101,6 +118,12 @@ class CMIP6Downloader(ClimateDownloader):
                  grid_map: object = None,
                  grid_override: object = None,
                  exclude_nodes: object = None,
+                 node_workers: int = NODE_WORKERS,
+                 cache_path: str = os.path.join(os.path.expanduser("~"),
+                                                ".icenet", "esgf_cache"),
+                 cache_ttl: int = 86400 * 7,
+                 no_cache: bool = False,
+                 query_retries: int = 3,
                  **kwargs):
         super().__init__(*args,
                          identifier="cmip6.{}.{}".format(source, member),
@@ -118,6 +141,145 @@ class CMIP6Downloader(ClimateDownloader):
         self._grid_map = grid_map if grid_map else CMIP6Downloader.GRID_MAP
         self._grid_map_override = grid_override
 
+        # Resolve the table and grid for each variable once, up front
+        self._var_meta = {
+            var_prefix: (table_id, grid_override
+                         if grid_override else self._grid_map[var_prefix])
+            for var_prefix, table_id in self._table_map.items()
+            if grid_override or var_prefix in self._grid_map
+        }
+
+        if not len(self._nodes):
+            logging.warning("No ESGF nodes left to query after exclusions, "
+                            "no data will be found")
+
+        # At least one worker, as an executor cannot be created with none.
+        # The pool is shared and kept small, so queries against lower
+        # priority nodes stay queued, and can be cancelled, until the higher
+        # priority ones have answered, and the thread count stays bounded
+        # however many experiments and variables are queried at once
+        self._node_workers = max(
+            1, node_workers if node_workers else self.NODE_WORKERS)
+        self._node_executor = ThreadPoolExecutor(
+            max_workers=self._node_workers)
+
+        self._cache_path = None if no_cache else cache_path
+        self._cache_ttl = cache_ttl
+        self._query_retries = query_retries
+
+        if self._cache_path:
+            os.makedirs(self._cache_path, exist_ok=True)
+
+    def _query_node(self, query: dict, data_node: str):
+        """Runs a single ESGF search against a data node, timing the request
+
+        Results are cached on disk, keyed on the search parameters, so that
+        repeated runs don't need to go back to the nodes at all. Failed
+        requests are retried with an exponential backoff.
+
+        :param query: the ESGF search parameters
+        :param data_node: the data node to restrict the search to
+        :return: list of result URLs
+        """
+        query = dict(query, data_node=data_node)
+        cache_file = None
+
+        if self._cache_path:
+            key = hashlib.blake2b(
+                json.dumps(query, sort_keys=True).encode()).hexdigest()
+            cache_file = os.path.join(self._cache_path, "{}.json".format(key))
+
+            try:
+                if time.time() - os.path.getmtime(cache_file) \
+                        < self._cache_ttl:
+                    with open(cache_file, "r") as fh:
+                        logging.debug("Using cached results {} for {}".format(
+                            cache_file, query))
+                        return json.load(fh)
+            except (OSError, ValueError):
+                pass
+
+        start = time.time()
+        attempts = max(1, self._query_retries)
+
+        # Failures raise out of here once the attempts are exhausted, so only
+        # a completed search ever reaches the cache below
+        for attempt in range(attempts):
+            try:
+                node_results = esgf_search(**query)
+                break
+            except requests.exceptions.RequestException:
+                if attempt == attempts - 1:
+                    raise
+                logging.warning("Query against {} failed, retrying".format(
+                    data_node))
+                time.sleep(0.3 * 2**attempt)
+
+        logging.debug("Query for {} against {} took {:.2f}s".format(
+            query['experiment_id'], data_node,
+            time.time() - start))
+
+        if cache_file:
+            # Write then rename, so concurrent readers never see partial files
+            fd, tmp_file = tempfile.mkstemp(dir=self._cache_path,
+                                            suffix=".tmp")
+            with os.fdopen(fd, "w") as fh:
+                json.dump(node_results, fh)
+            os.replace(tmp_file, cache_file)
+
+        return node_results
+
+    def _query_experiment(self, query: dict, experiment_id: str):
+        """Queries the nodes for a single experiment via the shared pool
+
+        Node priority is preserved: the results from the earliest node in
+        self._nodes that returns anything are used, and outstanding queries
+        against lower priority nodes are cancelled as soon as that is known.
+
+        :param query: the ESGF search parameters, sans experiment_id
+        :param experiment_id: the experiment to search for
+        :return: list of result URLs
+        """
+        query = dict(query, experiment_id=experiment_id)
+        node_results = [None] * len(self._nodes)
+        results = []
+
+        futures = {
+            self._node_executor.submit(self._query_node, query, data_node): idx
+            for idx, data_node in enumerate(self._nodes)
+        }
+
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    node_results[futures[future]] = future.result()
+                except Exception as e:
+                    logging.warning("Query against {} failed: {}".format(
+                        self._nodes[futures[future]], e))
+                    node_results[futures[future]] = []
+
+                # FIXME: inefficient, we can strip redundant results files
+                #  based on WCRP data management standards for file naming,
+                #  such as based on date. Refactor/rewrite this impl...
+                for idx, res in enumerate(node_results):
+                    if res is None:
+                        break
+                    elif len(res):
+                        logging.debug("Query: {}".format(
+                            dict(query, data_node=self._nodes[idx])))
+                        logging.debug("Found {}: {}".format(
+                            experiment_id, res))
+                        results = res
+                        break
+
+                if len(results):
+                    break
+        finally:
+            for future in futures:
+                future.cancel()
+
+        return results
+
     def _single_download(self, var_prefix: str, level: object,
                          req_dates: object):
         """Overridden CMIP implementation for downloading from DAP server
@@ -131,67 +293,128 @@ class CMIP6Downloader(ClimateDownloader):
         :param req_dates:
         """
 
+        table_id, grid_label = self._var_meta[var_prefix]
+
         query = {
-            'source_id':
-                self._source,
-            'member_id':
-                self._member,
-            'frequency':
-                self._frequency,
-            'variable_id':
-                var_prefix,
-            'table_id':
-                self._table_map[var_prefix],
-            'grid_label':
-                self._grid_map_override
-                if self._grid_map_override else self._grid_map[var_prefix],
+            'source_id': self._source,
+            'member_id': self._member,
+            'frequency': self._frequency,
+            'variable_id': var_prefix,
+            'table_id': table_id,
+            'grid_label': grid_label,
         }
 
         var = var_prefix if not level else "{}{}".format(var_prefix, level)
 
         logging.info("Querying ESGF")
-        results = []
-
-        for experiment_id in self._experiments:
-            query['experiment_id'] = experiment_id
-
-            for data_node in self._nodes:
-                query['data_node'] = data_node
-
-                # FIXME: inefficient, we can strip redundant results files
-                #  based on WCRP data management standards for file naming,
-                #  such as based on date. Refactor/rewrite this impl...
-                node_results = esgf_search(**query)
 
-                if len(node_results):
-                    logging.debug("Query: {}".format(query))
-                    logging.debug("Found {}: {}".format(experiment_id,
-                                                        node_results))
-                    results.extend(node_results)
-                    break
+        with ThreadPoolExecutor(max_workers=max(1, len(self._experiments))) \
+                as executor:
+            experiment_results = [
+                experiment_result for experiment_result in executor.map(
+                    lambda experiment_id: self._query_experiment(
+                        query, experiment_id), self._experiments)
+                if len(experiment_result)
+            ]
+        results = [url for urls in experiment_results for url in urls]
 
         logging.info("Found {} {} results from ESGF search".format(
             len(results), var_prefix))
 
-        try:
-            # http://xarray.pydata.org/en/stable/user-guide/io.html?highlight=opendap#opendap
-            # Avoid 500MB DAP request limit
-            cmip6_da = xr.open_mfdataset(results,
-                                         combine='by_coords',
-                                         chunks={'time': '499MB'})[var_prefix]
+        if not len(results):
+            logging.warning("No results for {}, skipping".format(var_prefix))
+            return
 
-            cmip6_da = cmip6_da.sel(time=slice(req_dates[0], req_dates[-1]))
+        combine_kwargs = dict(data_vars='minimal',
+                              coords='minimal',
+                              compat='override')
 
+        try:
+            # http://xarray.pydata.org/en/stable/user-guide/io.html?highlight=opendap#opendap
+            # Avoid 500MB DAP request limit: chunks are capped well under
+            # it. Results for a single source/member share coordinates, so
+            # we open in parallel and skip the coordinate comparisons
+            chunks = self._source_chunks(
+                results[0],
+                var_prefix,
+                single_dims=('plev',) if level else ())
+
+            # CF decoding (especially times via cftime) is slow per file, so
+            # it's done once per experiment on the combined dataset. Files
+            # within an experiment share time units, experiments need not
+            experiment_ds = [
+                xr.decode_cf(
+                    xr.open_mfdataset(urls,
+                                      combine='by_coords',
+                                      parallel=True,
+                                      decode_cf=False,
+                                      chunks=chunks,
+                                      **combine_kwargs))
+                for urls in experiment_results
+            ]
+            cmip6_da = xr.combine_by_coords(experiment_ds,
+                                            **combine_kwargs)[var_prefix]
+
+            # Subset the level first, so nothing downstream of the open
+            # ever touches the full 4D cube
             # TODO: possibly other attributes, especially with ocean vars
             if level:
                 cmip6_da = cmip6_da.sel(plev=int(level) * 100)
 
+            cmip6_da = cmip6_da.sel(time=slice(req_dates[0], req_dates[-1]))
             cmip6_da = cmip6_da.sel(
                 lat=slice(self.hemisphere_loc[2], self.hemisphere_loc[0]))
+
+            # Downcast lazily so every chunk is produced, and stored, as
+            # float32: the regridded output ends up there anyway
+            cmip6_da = cmip6_da.astype(np.float32, copy=False)
             self.save_temporal_files(var, cmip6_da)
         except OSError as e:
             logging.exception("Error encountered: {}".format(e), exc_info=False)
 
+    @staticmethod
+    def _source_chunks(url: str,
+                       var_prefix: str,
+                       single_dims: object = (),
+                       max_chunk_bytes: int = 128 * 2**20) -> dict:
+        """Derives dask chunks aligned to the on-disk chunking of a result
+
+        Spatial chunks match those in the source file, whilst the time chunk
+        is the largest multiple of the source time chunk under the byte limit,
+        so that every dask read maps onto whole HDF5 chunks. If the source
+        doesn't report chunking we fall back to automatic chunking.
+
+        Dimensions we're going to select a single index from (such as the
+        pressure level) get a chunk size of one, so the time chunk is sized
+        on the slab we'll actually read.
+
+        :param url: a representative result URL
+        :param var_prefix: the variable to inspect
+        :param single_dims: dimensions that will be subset to one index
+        :param max_chunk_bytes: upper bound on the size of a single chunk
+        :return: chunks dict suitable for xr.open_mfdataset
+        """
+        try:
+            with xr.open_dataset(url) as ds:
+                chunksizes = ds[var_prefix].encoding.get('chunksizes')
+                dims = ds[var_prefix].dims
+                itemsize = ds[var_prefix].dtype.itemsize
+        except (OSError, KeyError) as e:
+            logging.warning("Unable to inspect chunking of {}: {}".format(
+                url, e))
+            chunksizes = None
+
+        if not chunksizes or 'time' not in dims:
+            return {'time': 'auto'}
+
+        chunks = dict(zip(dims, chunksizes))
+        chunks.update({dim: 1 for dim in single_dims if dim in chunks})
+        chunk_bytes = int(np.prod(list(chunks.values()))) * itemsize
+        chunks['time'] *= max(1, max_chunk_bytes // chunk_bytes)
+
+        logging.debug("Using chunks {} based on {}".format(chunks, url))
+        return chunks
+
     def additional_regrid_processing(self, datafile: str, cube_ease: object):
         """
 
@@ -202,23 +425,23 @@ class CMIP6Downloader(ClimateDownloader):
         var_name = datafile_path.split(os.sep)[self._var_name_idx]
 
         # TODO: regrid fixes need better implementations
-        if var_name == "siconca":
-            cube_ease.data[cube_ease.data.mask] = 0.
-            cube_ease.data[:, self._masks.get_land_mask()] = 0.
+        if var_name in ["siconca", "tos", "hus1000"]:
+            # Combine the regrid mask and land mask so we zero in one pass,
+            # working on the underlying float32 array rather than the masked
+            data = np.ma.getdata(cube_ease.data).astype(np.float32, copy=False)
+            zero_mask = np.ma.getmaskarray(cube_ease.data) | \
+                self._masks.get_land_mask()
 
-            if self._source == 'MRI-ESM2-0':
-                cube_ease.data = cube_ease.data / 100.
-            cube_ease.data = cube_ease.data.data
-        elif var_name in ["tos", "hus1000"]:
-            cube_ease.data[cube_ease.data.mask] = 0.
-            cube_ease.data[:, self._masks.get_land_mask()] = 0.
+            if var_name == "siconca" and self._source == 'MRI-ESM2-0':
+                data *= 0.01
 
-            cube_ease.data = cube_ease.data.data
+            np.putmask(data, zero_mask, 0.)
+            cube_ease.data = data
 
         if cube_ease.data.dtype != np.float32:
             logging.info("Regrid processing, data type not float: {}".format(
                 cube_ease.data.dtype))
-            cube_ease.data = cube_ease.data.astype(np.float32)
+            cube_ease.data = cube_ease.data.astype(np.float32, copy=False)
 
     def convert_cube(self, cube: object) -> object:
         """Converts Iris cube to be fit for CMIP regrid
@@ -243,6 +466,9 @@ def main():
                               dict(default=[], nargs="*")),
                              (("-o", "--override"), dict(required=None,
                                                          type=str)),
+                             (("-nc", "--no-cache"),
+                              dict(default=False, action="store_true",
+                                   dest="no_cache")),
                          ],
                          workers=True)
 
@@ -263,6 +489,7 @@ def main():
         south=args.hemisphere == "south",
         max_threads=args.workers,
         exclude_nodes=args.exclude_server,
+        no_cache=args.no_cache,
     )
     logging.info("CMIP downloading: {} {}".format(args.source, args.member))
     downloader.download()
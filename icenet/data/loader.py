@@ -76,6 +76,14 @@ def create_get_args() -> object:
                     help="Skip existing tfrecords",
                     default=False,
                     action="store_true")
+    ap.add_argument("-sd",
+                    "--storage-dtype",
+                    help="Store records at reduced precision, cast back to "
+                    "the dataset dtype on load",
+                    choices=("float16",),
+                    default=None,
+                    dest="storage_dtype",
+                    type=str)
     ap.add_argument("-t",
                     "--tmp-dir",
                     help="Temporary directory",
@@ -116,6 +124,7 @@ def create():
         south=args.hemisphere == "south",
         output_batch_size=args.batch_size,
         pickup=args.pickup,
+        storage_dtype=args.storage_dtype,
         generate_workers=args.workers,
         dask_port=args.dask_port,
         futures_per_worker=args.futures)
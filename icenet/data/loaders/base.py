@@ -27,6 +27,7 @@ class IceNetBaseDataLoader(Generator):
     :param n_forecast_days:
     :param output_batch_size:
     :param path:
+    :param storage_dtype:
     :param var_lag_override:
     """
 
@@ -44,6 +45,7 @@ class IceNetBaseDataLoader(Generator):
                  output_batch_size: int = 32,
                  path: str = os.path.join(".", "network_datasets"),
                  pickup: bool = False,
+                 storage_dtype: str = None,
                  var_lag_override: object = None,
                  **kwargs):
         super().__init__(*args, identifier=identifier, path=path, **kwargs)
@@ -62,6 +64,8 @@ class IceNetBaseDataLoader(Generator):
         self._n_forecast_days = n_forecast_days
         self._output_batch_size = output_batch_size
         self._pickup = pickup
+        self._sample_files = None
+        self._storage_dtype = storage_dtype
         self._trend_steps = dict()
         self._workers = generate_workers
 
@@ -127,6 +131,12 @@ class IceNetBaseDataLoader(Generator):
         # FIXME: is this not just the same as _channel_files now?
         # FIXME: still experimental code, move to multiple implementations
         # FIXME: CLEAN THIS ALL UP ONCE VERIFIED FOR local/shared STORAGE!
+
+        # Channels are fixed once constructed, so resolve the files only once
+        # rather than for every batch or sample requested
+        if self._sample_files is not None:
+            return self._sample_files
+
         var_files = dict()
 
         for var_name, num_channels in self._channels.items():
@@ -141,6 +151,7 @@ class IceNetBaseDataLoader(Generator):
                 raise RuntimeError("Differing files? {} {} vs {}".format(
                     var_name, var_file, var_files[var_name]))
 
+        self._sample_files = var_files
         return var_files
 
     def _add_channel_files(self, var_name: str, filelist: object):
@@ -291,6 +302,7 @@ class IceNetBaseDataLoader(Generator):
             # FIXME: this naming is inconsistent, sort it out!!! ;)
             "shape": list(self._shape),
             "south": self.south,
+            "storage_dtype": self._storage_dtype,
 
             # For recreating this dataloader
             # "dataset_config_path = ".",
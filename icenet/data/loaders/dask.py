@@ -1,4 +1,5 @@
 import datetime as dt
+import functools
 import logging
 import os
 import time
@@ -131,8 +132,11 @@ class DaskMultiWorkerLoader(DaskBaseDataLoader):
         super().__init__(*args, **kwargs)
 
         masks = Masks(north=self.north, south=self.south)
-        self._masks = da.array(
-            [masks.get_active_cell_mask(month) for month in range(1, 13)])
+        # Stacked month-last so lead time masks gather straight into the
+        # (yc, xc, leadtime) sample layout, and cast once to the sample dtype
+        self._masks = da.stack(
+            [masks.get_active_cell_mask(month) for month in range(1, 13)],
+            axis=-1).astype(self._dtype)
 
         self._futures = futures_per_worker
 
@@ -168,16 +172,21 @@ class DaskMultiWorkerLoader(DaskBaseDataLoader):
                 i += num
 
         masks = client.scatter(self._masks, broadcast=True)
+        missing_dates = frozenset(self._missing_dates)
 
         for dataset in splits:
             batch_number = 0
             futures = []
 
-            forecast_dates = set([
-                dt.datetime.strptime(s, IceNetPreProcessor.DATE_FORMAT).date()
-                for identity in self._config["sources"].keys()
-                for s in self._config["sources"][identity]["dates"][dataset]
-            ])
+            # Sources largely share dates, so deduplicate the strings before
+            # parsing them in a single vectorised call
+            forecast_dates = set(
+                pd.to_datetime(
+                    sorted(
+                        set(s for identity in self._config["sources"].keys()
+                            for s in self._config["sources"][identity]
+                            ["dates"][dataset])),
+                    format=IceNetPreProcessor.DATE_FORMAT).date)
 
             if dates_override:
                 logging.info("{} available {} dates".format(
@@ -198,7 +207,7 @@ class DaskMultiWorkerLoader(DaskBaseDataLoader):
                      not os.path.exists(tf_path.format(batch_number))):
                     args = [
                         self._channels, self._dtype, self._loss_weight_days,
-                        self._meta_channels, self._missing_dates,
+                        self._meta_channels, missing_dates,
                         self._n_forecast_days, self.num_channels, self._shape,
                         self._trend_steps, masks, False
                     ]
@@ -208,7 +217,8 @@ class DaskMultiWorkerLoader(DaskBaseDataLoader):
                                         self.get_sample_files(),
                                         dates,
                                         args,
-                                        dry=self._dry)
+                                        dry=self._dry,
+                                        storage_dtype=self._storage_dtype)
                     futures.append(fut)
 
                     # Use this to limit the future list, to avoid crashing the
@@ -253,46 +263,95 @@ class DaskMultiWorkerLoader(DaskBaseDataLoader):
         :return:
         """
 
-        ds_kwargs = dict(
-            chunks=dict(time=1, yc=self._shape[0], xc=self._shape[1]),
-            drop_variables=["month", "plev", "level", "realization"],
-            parallel=parallel,
-        )
         var_files = self.get_sample_files()
-
-        var_ds = xr.open_mfdataset([
-            v for k, v in var_files.items()
-            if k not in self._meta_channels and not k.endswith("linear_trend")
-        ], **ds_kwargs)
-
-        var_ds = var_ds.transpose("yc", "xc", "time")
-
-        trend_files = \
-            [v for k, v in var_files.items()
-             if k.endswith("linear_trend")]
-        trend_ds = None
-
-        if len(trend_files) > 0:
-            trend_ds = xr.open_mfdataset(trend_files, **ds_kwargs)
-
-            trend_ds = trend_ds.transpose("yc", "xc", "time")
+        var_ds, trend_ds = open_sample_datasets(
+            tuple(sorted(var_files.items())), tuple(self._meta_channels),
+            tuple(self._shape), parallel, self._dtype)
 
         args = [
             self._channels, self._dtype, self._loss_weight_days,
-            self._meta_channels, self._missing_dates, self._n_forecast_days,
+            self._meta_channels, frozenset(self._missing_dates),
+            self._n_forecast_days,
             self.num_channels, self._shape, self._trend_steps, self._masks,
             prediction
         ]
 
         x, y, sw = generate_sample(date, var_ds, var_files, trend_ds, *args)
-        return x.compute(), y.compute(), sw.compute()
+        # The three arrays share source reads and masks, so compute them
+        # together: one graph execution loads each chunk once and runs the
+        # independent reads concurrently
+        return dask.compute(x, y, sw)
+
+
+@functools.lru_cache(maxsize=8)
+def load_meta_array(path: str) -> object:
+    """Load a processed meta variable once per worker.
+
+    Meta channels are tiny and identical for every sample, so reopening the
+    NetCDF file for each one only pays the file open and metadata cost again.
+
+    :param path:
+    :return:
+    """
+    with xr.open_dataarray(path) as meta_da:
+        meta_da = meta_da.load()
+    meta_da.data.setflags(write=False)
+    return meta_da
+
+
+@functools.lru_cache(maxsize=4)
+def open_sample_datasets(var_files: tuple,
+                         meta_channels: tuple,
+                         shape: tuple,
+                         parallel: bool = True,
+                         dtype: object = None) -> tuple:
+    """Open the processed variable and trend files for sample generation.
+
+    The datasets are lazy and every sample reads from the same set of files,
+    so they are opened once per process and reused by both the loader and
+    the dask workers writing batches, rather than reopening and rescanning
+    every file's metadata per batch or sample.
+
+    :param var_files: sorted tuple of (variable name, path) pairs
+    :param meta_channels:
+    :param shape:
+    :param parallel:
+    :param dtype: dtype to cast the variables to, as CF packed variables
+        otherwise decode to float64
+    :return: tuple of variable and trend datasets, the latter None if there
+        are no trend files
+    """
+    ds_kwargs = dict(
+        chunks=dict(time=1, yc=shape[0], xc=shape[1]),
+        drop_variables=["month", "plev", "level", "realization"],
+        parallel=parallel,
+    )
+
+    var_ds = xr.open_mfdataset([
+        v for k, v in var_files
+        if k not in meta_channels and not k.endswith("linear_trend")
+    ], **ds_kwargs)
+    var_ds = var_ds.transpose("yc", "xc", "time")
+
+    if dtype is not None:
+        var_ds = var_ds.astype(dtype)
+
+    trend_files = [v for k, v in var_files if k.endswith("linear_trend")]
+    trend_ds = None
+
+    if len(trend_files):
+        trend_ds = xr.open_mfdataset(trend_files, **ds_kwargs)
+        trend_ds = trend_ds.transpose("yc", "xc", "time")
+
+    return var_ds, trend_ds
 
 
 def generate_and_write(path: str,
                        var_files: object,
                        dates: object,
                        args: tuple,
-                       dry: bool = False):
+                       dry: bool = False,
+                       storage_dtype: str = None):
     """
 
     :param path:
@@ -300,6 +359,7 @@ def generate_and_write(path: str,
     :param dates:
     :param args:
     :param dry:
+    :param storage_dtype:
     :return:
     """
     count = 0
@@ -311,53 +371,110 @@ def generate_and_write(path: str,
      n_forecast_days, num_channels, shape, trend_steps, masks,
      prediction) = args
 
-    ds_kwargs = dict(
-        chunks=dict(time=1, yc=shape[0], xc=shape[1]),
-        drop_variables=["month", "plev", "realization"],
-        parallel=True,
-    )
-
-    var_ds = xr.open_mfdataset([
-        v for k, v in var_files.items()
-        if k not in meta_channels and not k.endswith("linear_trend")
-    ], **ds_kwargs)
-    var_ds = var_ds.transpose("yc", "xc", "time")
+    var_ds, trend_ds = open_sample_datasets(tuple(sorted(var_files.items())),
+                                            tuple(meta_channels),
+                                            tuple(shape),
+                                            dtype=dtype)
 
-    trend_files = [
-        v for k, v in var_files.items() if k.endswith("linear_trend")
-    ]
-    trend_ds = None
+    # Batches can span gaps between date ranges, so samples are generated
+    # per run of consecutive forecast dates, which share most of their time
+    # steps and can be loaded together
+    date_runs = []
 
-    if len(trend_files):
-        trend_ds = xr.open_mfdataset(trend_files, **ds_kwargs)
-        trend_ds = trend_ds.transpose("yc", "xc", "time")
+    for date in dates:
+        if len(date_runs) and \
+                date - date_runs[-1][-1] == dt.timedelta(days=1):
+            date_runs[-1].append(date)
+        else:
+            date_runs.append([date])
 
     with tf.io.TFRecordWriter(path) as writer:
-        for date in dates:
-            start = time.time()
-
-            try:
-                x, y, sample_weights = generate_sample(date, var_ds, var_files,
-                                                       trend_ds, *args)
-                if not dry:
-                    x[da.isnan(x)] = 0.
-
-                    x, y, sample_weights = dask.compute(x,
-                                                        y,
-                                                        sample_weights,
-                                                        optimize_graph=True)
-                    write_tfrecord(writer, x, y, sample_weights)
-                count += 1
-            except IceNetDataWarning:
-                continue
-
-            end = time.time()
-            times.append(end - start)
-            logging.debug("Time taken to produce {}: {}".format(
-                date, times[-1]))
+        for date_run in date_runs:
+            run_var_ds, run_trend_ds = var_ds, trend_ds
+
+            if not dry:
+                run_var_ds, run_trend_ds = load_sample_windows(
+                    date_run, var_ds, trend_ds, channels, meta_channels,
+                    n_forecast_days, prediction)
+
+            for date in date_run:
+                start = time.time()
+
+                try:
+                    x, y, sample_weights = generate_sample(
+                        date, run_var_ds, var_files, run_trend_ds, *args)
+                    if not dry:
+                        x[da.isnan(x)] = 0.
+
+                        x, y, sample_weights = dask.compute(
+                            x, y, sample_weights, optimize_graph=True)
+                        write_tfrecord(writer, x, y, sample_weights,
+                                       storage_dtype=storage_dtype)
+                    count += 1
+                except IceNetDataWarning:
+                    continue
+
+                end = time.time()
+                times.append(end - start)
+                logging.debug("Time taken to produce {}: {}".format(
+                    date, times[-1]))
     return path, count, times
 
 
+def load_sample_windows(dates: list,
+                        var_ds: object,
+                        trend_ds: object,
+                        channels: object,
+                        meta_channels: object,
+                        n_forecast_days: int,
+                        prediction: bool = False) -> tuple:
+    """Load the time steps a run of consecutive forecast dates reads.
+
+    Each variable is loaded only over its own window: lagged inputs back
+    from the first date, trends forward from the last date and the output
+    forward over the forecast horizon. Time steps outside a variable's window
+    are never selected for it by the samples in the run.
+
+    :param dates: consecutive forecast dates
+    :param var_ds:
+    :param trend_ds:
+    :param channels:
+    :param meta_channels:
+    :param n_forecast_days:
+    :param prediction:
+    :return: tuple of in memory variable and trend datasets
+    """
+    run_start, run_end = pd.Timestamp(dates[0]), pd.Timestamp(dates[-1])
+    var_windows, trend_windows = dict(), dict()
+
+    for var_name, num_channels in channels.items():
+        if var_name in meta_channels:
+            continue
+
+        if var_name.endswith("linear_trend"):
+            trend_windows[var_name] = \
+                (run_start, run_end + dt.timedelta(days=num_channels - 1))
+        else:
+            var_windows[var_name] = \
+                (run_start - dt.timedelta(days=num_channels - 1), run_end)
+
+    if not prediction:
+        output_start, _ = var_windows.get("siconca_abs", (run_start, None))
+        var_windows["siconca_abs"] = \
+            (output_start, run_end + dt.timedelta(days=n_forecast_days - 1))
+
+    def _load(ds, windows):
+        # Variables are aligned onto the union of their windows, with
+        # steps outside a variable's own window left as NaN
+        return xr.Dataset({
+            var_name: getattr(ds, var_name).sel(time=slice(*window))
+            for var_name, window in windows.items()
+        }).load().chunk(-1)
+
+    return _load(var_ds, var_windows), \
+        _load(trend_ds, trend_windows) if trend_ds is not None else None
+
+
 def generate_sample(forecast_date: object,
                     var_ds: object,
                     var_files: object,
@@ -400,95 +517,88 @@ def generate_sample(forecast_date: object,
         forecast_date + dt.timedelta(days=n) for n in range(n_forecast_days)
     ]
 
-    y = da.zeros((*shape, n_forecast_days, 1), dtype=dtype)
-    sample_weights = da.zeros((*shape, n_forecast_days, 1), dtype=dtype)
-
     if not prediction:
-        try:
-            sample_output = var_ds.siconca_abs.sel(time=forecast_dts)
-        except KeyError as sic_ex:
-            logging.exception(
-                "Issue selecting data for non-prediction sample, "
-                "please review siconca ground-truth: dates {}".format(
-                    forecast_dts))
-            raise RuntimeError(sic_ex)
-        y[:, :, :, 0] = sample_output
-
-    # Masked recomposition of output
-    for leadtime_idx in range(n_forecast_days):
-        forecast_day = forecast_date + dt.timedelta(days=leadtime_idx)
-
-        if any([forecast_day == missing_date for missing_date in missing_dates]):
-            sample_weight = da.zeros(shape, dtype)
-        else:
-            # Zero loss outside of 'active grid cells'
-            sample_weight = masks[forecast_day.month - 1]
-            sample_weight = sample_weight.astype(dtype)
-
-            # We can pick up nans, which messes up training
-            sample_weight[da.isnan(y[..., leadtime_idx, 0])] = 0
-
-            # Scale the loss for each month s.t. March is
-            #   scaled by 1 and Sept is scaled by 1.77
-            if loss_weight_days:
-                sample_weight *= 33928. / sample_weight.sum()
-
-        sample_weights[:, :, leadtime_idx, 0] = sample_weight
+        # Dates absent from the ground truth come through as nans, so they
+        # carry no weight below rather than failing the whole sample
+        sample_output = var_ds.siconca_abs.reindex(
+            time=pd.to_datetime(forecast_dts))
+        # var_ds is already (yc, xc, time), so the selection is the output
+        # layout and only needs the trailing variable axis
+        y = sample_output.data.astype(dtype)[..., np.newaxis]
+    else:
+        y = da.zeros((*shape, n_forecast_days, 1), dtype=dtype)
+
+    # Masked recomposition of output, built for all lead times at once
+    # Zero loss outside of 'active grid cells'
+    sample_weights = masks[..., [day.month - 1 for day in forecast_dts]]
+
+    # Missing dates carry no weight at all and we can pick up nans, which
+    # messes up training, so both are zeroed in a single pass
+    present = np.array([day not in missing_dates for day in forecast_dts])
+    sample_weights = da.where(~present | da.isnan(y[..., 0]), 0,
+                              sample_weights)
+
+    # Scale the loss for each month s.t. March is
+    #   scaled by 1 and Sept is scaled by 1.77
+    if loss_weight_days:
+        weight_sums = sample_weights.sum(axis=(0, 1))
+        weight_sums = da.where(weight_sums > 0, weight_sums, 1.)
+        sample_weights = sample_weights * (33928. / weight_sums)
+
+    sample_weights = sample_weights.astype(dtype)[..., np.newaxis]
 
     # INPUT FEATURES
-    x = da.zeros((*shape, num_channels), dtype=dtype)
-    v1, v2 = 0, 0
+    # Channel blocks are concatenated once at the end, so each is computed
+    # straight into its place in the sample rather than being written into
+    # a zero filled array by repeated slice assignment
+    x_blocks = []
 
     for var_name, num_channels in channels.items():
         if var_name in meta_channels:
             continue
 
-        v2 += num_channels
-
+        # Channel dates are built as whole date ranges rather than one
+        # timedelta addition per channel
         if var_name.endswith("linear_trend"):
             channel_ds = trend_ds
             if type(trend_steps) == list:
-                channel_dates = [
-                    pd.Timestamp(forecast_date + dt.timedelta(days=int(n)))
-                    for n in trend_steps
-                ]
+                channel_dates = pd.Timestamp(forecast_date) + \
+                    pd.to_timedelta(trend_steps, unit="D")
             else:
-                channel_dates = [
-                    pd.Timestamp(forecast_date + dt.timedelta(days=n))
-                    for n in range(num_channels)
-                ]
+                channel_dates = pd.date_range(forecast_date,
+                                              periods=num_channels,
+                                              freq="D")
         else:
             channel_ds = var_ds
-            channel_dates = [
-                pd.Timestamp(forecast_date - dt.timedelta(days=n))
-                for n in range(num_channels)
-            ]
-
-        channel_data = []
-        for cdate in channel_dates:
-            try:
-                channel_data.append(
-                    getattr(channel_ds, var_name).sel(time=cdate))
-            except KeyError:
-                channel_data.append(da.zeros(shape))
-
-        x[:, :, v1:v2] = da.from_array(channel_data).transpose([1, 2, 0])
-        v1 += num_channels
+            channel_dates = pd.date_range(end=forecast_date,
+                                          periods=num_channels,
+                                          freq="D")[::-1]
+
+        # Select every channel date in one lookup, with dates missing from
+        # the source zero filled, rather than a label lookup per channel
+        channel_data = getattr(channel_ds, var_name).reindex(
+            time=channel_dates, fill_value=0.)
+
+        # Source datasets are already (yc, xc, time) and reindex keeps that
+        x_blocks.append(channel_data.data.astype(dtype))
 
     for var_name in meta_channels:
         if channels[var_name] > 1:
             raise RuntimeError("{} meta variable cannot have more than "
                                "one channel".format(var_name))
 
-        meta_ds = xr.open_dataarray(var_files[var_name])
+        meta_ds = load_meta_array(var_files[var_name])
 
         if var_name in ["sin", "cos"]:
-            ref_date = "2012-{}-{}".format(forecast_date.month,
-                                           forecast_date.day)
+            # Circular day values are stored against the 2012 leap year
+            ref_date = pd.Timestamp(2012, forecast_date.month,
+                                    forecast_date.day)
             trig_val = meta_ds.sel(time=ref_date).to_numpy()
-            x[:, :, v1] = da.broadcast_to([trig_val], shape)
+            x_blocks.append(da.full((*shape, 1), trig_val, dtype=dtype))
         else:
-            x[:, :, v1] = da.array(meta_ds.to_numpy())
-        v1 += channels[var_name]
+            meta_data = meta_ds.to_numpy()[..., np.newaxis]
+            x_blocks.append(da.from_array(meta_data).astype(dtype))
+
+    x = da.concatenate(x_blocks, axis=-1)
 
     return x, y, sample_weights
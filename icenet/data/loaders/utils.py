@@ -9,13 +9,14 @@ class IceNetDataWarning(RuntimeWarning):
 
 
 def write_tfrecord(writer: object, x: object, y: object,
-                   sample_weights: object):
+                   sample_weights: object, storage_dtype: str = None):
     """
 
     :param writer:
     :param x:
     :param y:
     :param sample_weights:
+    :param storage_dtype: if set, store arrays as raw bytes of this dtype
     :param data_check:
     """
 
@@ -37,17 +38,22 @@ def write_tfrecord(writer: object, x: object, y: object,
 
     #        if data_check and x_nans > 0:
 
+    if storage_dtype is not None:
+        # Reduced precision storage, e.g. float16, halves the record size.
+        # FloatList is always 32-bit so the arrays go in as raw bytes
+        def _feature(arr):
+            return tf.train.Feature(bytes_list=tf.train.BytesList(
+                value=[arr.astype(storage_dtype).tobytes()]))
+    else:
+        def _feature(arr):
+            return tf.train.Feature(float_list=tf.train.FloatList(
+                value=arr.reshape(-1)))
+
     record_data = tf.train.Example(features=tf.train.Features(
         feature={
-            "x":
-                tf.train.Feature(float_list=tf.train.FloatList(
-                    value=x.reshape(-1))),
-            "y":
-                tf.train.Feature(float_list=tf.train.FloatList(
-                    value=y.reshape(-1))),
-            "sample_weights":
-                tf.train.Feature(float_list=tf.train.FloatList(
-                    value=sample_weights.reshape(-1))),
+            "x": _feature(x),
+            "y": _feature(y),
+            "sample_weights": _feature(sample_weights),
         })).SerializeToString()
 
     writer.write(record_data)
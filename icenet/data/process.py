@@ -1,16 +1,19 @@
 import datetime as dt
+import hashlib
 import json
 import logging
 import os
 
+from concurrent.futures import ThreadPoolExecutor
+
 import dask
+import dask.array
 import numpy as np
 import pandas as pd
 import xarray as xr
 
 from icenet.data.producers import Processor
 from icenet.data.sic.mask import Masks
-from icenet.model.models import linear_trend_forecast
 """
 
 """
@@ -37,12 +40,15 @@ class IceNetPreProcessor(Processor):
     :param missing_dates:
     :param minmax:
     :param no_normalise:
+    :param packed_vars:
     :param path:
     :param parallel_opens:
     :param ref_procdir:
+    :param skip_unchanged:
     :param source_data:
     :param update_key:
     :param update_loader:
+    :param workers:
     """
 
     DATE_FORMAT = "%Y_%m_%d"
@@ -71,12 +77,15 @@ class IceNetPreProcessor(Processor):
             missing_dates=tuple(),
             minmax=True,
             no_normalise=tuple(["siconca"]),
+            packed_vars=tuple(),
             path=os.path.join(".", "processed"),
             parallel_opens=False,
             ref_procdir=None,
+            skip_unchanged=False,
             source_data=os.path.join(".", "data"),
             update_key=None,
             update_loader=True,
+            workers=1,
             **kwargs):
         super().__init__(identifier,
                          source_data,
@@ -101,14 +110,17 @@ class IceNetPreProcessor(Processor):
         self._linear_trends = linear_trends
         self._missing_dates = list(missing_dates)
         self._no_normalise = no_normalise
+        self._packed_vars = packed_vars
         self._normalise = self._normalise_array_mean \
             if not minmax else self._normalise_array_scaling
         self._parallel = parallel_opens
         self._refdir = ref_procdir
+        self._skip_unchanged = skip_unchanged
         self._update_key = self.identifier if not update_key else update_key
         self._update_loader = os.path.join(".",
                                            "loader.{}.json".format(name)) \
             if update_loader else None
+        self._workers = workers
 
         if type(linear_trend_steps) == int:
             logging.debug(
@@ -124,13 +136,38 @@ class IceNetPreProcessor(Processor):
         """
         var_suffixes = ["abs", "anom"]
         var_lists = [self._abs_vars, self._anom_vars]
+        var_tasks = dict()
+
         for var_suffix, var_list in zip(var_suffixes, var_lists):
             for var_name in var_list:
                 if var_name not in self._var_files.keys():
                     logging.warning("{} does not exist".format(var_name))
                     continue
+                var_tasks.setdefault(var_name, []).append(var_suffix)
+
+        # Variables are independent of each other, but the abs and anom
+        # outputs of one variable share normalisation parameters, so they
+        # stay in order within a single task
+        def save_suffixes(var_name):
+            for var_suffix in var_tasks[var_name]:
                 self._save_variable(var_name, var_suffix)
 
+        with dask.config.set(**{'array.slicing.split_large_chunks': True}):
+            if self._workers > 1 and len(var_tasks) > 1:
+                logging.info("Processing {} variables with {} workers".format(
+                    len(var_tasks), self._workers))
+
+                with ThreadPoolExecutor(max_workers=min(
+                        self._workers, len(var_tasks))) as executor:
+                    for future in [
+                            executor.submit(save_suffixes, var_name)
+                            for var_name in var_tasks
+                    ]:
+                        future.result()
+            else:
+                for var_name in var_tasks:
+                    save_suffixes(var_name)
+
         if self._update_loader:
             self.update_loader_config()
 
@@ -156,6 +193,33 @@ class IceNetPreProcessor(Processor):
             "No post normalisation implemented for {}".format(var_name))
         return da
 
+    def _train_time_indexer(self, da: object):
+        """
+        Return an indexer for the training dates on the time axis of `da`: a
+        slice when they form one contiguous, duplicate free daily range that
+        `da` holds in full, which avoids a label lookup per date, otherwise
+        the dates themselves (so missing dates still raise a KeyError).
+
+        Note the slice selects in time order, whereas the dates select in the
+        order given; both consumers reduce over time so this is immaterial.
+
+        :param da:
+        :return:
+        """
+        train_index = pd.DatetimeIndex(sorted(set(self._dates.train)))
+
+        if len(train_index) == len(self._dates.train) > 0 and \
+                (train_index[-1] - train_index[0]).days == \
+                len(train_index) - 1:
+            time_slice = slice(train_index[0], train_index[-1])
+            held = da.indexes["time"].slice_indexer(time_slice.start,
+                                                    time_slice.stop)
+
+            if len(range(*held.indices(da.sizes["time"]))) == \
+                    len(train_index):
+                return time_slice
+        return self._dates.train
+
     # TODO: update this to store parameters, if appropriate
     def update_loader_config(self):
         """
@@ -241,98 +305,194 @@ class IceNetPreProcessor(Processor):
         :param var_name:
         :param var_suffix:
         """
-        with dask.config.set(**{'array.slicing.split_large_chunks': True}):
-            da = self._open_dataarray_from_files(var_name)
-
-            # FIXME: we should ideally store train dates against the
-            #  normalisation and climatology, to ensure recalculation on
-            #  reprocess. All this need be is in the path, to be honest
-
-            if var_name in self._anom_vars:
-                if self._refdir:
-                    logging.info("Loading climatology from alternate "
-                                 "directory: {}".format(self._refdir))
-                    clim_path = os.path.join(self._refdir, "params",
-                                             "climatology.{}".format(var_name))
-                else:
-                    clim_path = os.path.join(
-                        self.get_data_var_folder("params"),
-                        "climatology.{}".format(var_name))
-
-                if not os.path.exists(clim_path):
-                    logging.info("Generating climatology {}".format(clim_path))
-
-                    if self._dates.train:
-                        climatology = da.sel(time=self._dates.train).\
-                            groupby('time.month', restore_coord_dims=True).\
-                            mean()
-
-                        climatology.to_netcdf(clim_path)
-                    else:
-                        raise RuntimeError(
-                            "{} does not exist and no "
-                            "training data is supplied".format(clim_path))
-                else:
-                    logging.info("Reusing climatology {}".format(clim_path))
-                    climatology = xr.open_dataarray(clim_path)
-
-                if not set(da.groupby("time.month").all().month.values).\
-                        issubset(set(climatology.month.values)):
-                    logging.warning(
-                        "We don't have a full climatology ({}) "
-                        "compared with data ({})".format(
-                            ",".join(
-                                [str(i) for i in climatology.month.values]),
-                            ",".join([
-                                str(i) for i in da.groupby(
-                                    "time.month").all().month.values
-                            ])))
-                    da = da - climatology.mean()
-                else:
-                    da = da.groupby("time.month") - climatology
+        manifest_key = self._variable_manifest_key(var_name, var_suffix)
 
-            # FIXME: this is not the way to reconvert underlying data on
-            #  dask arrays
-            da.data = np.asarray(da.data, dtype=self._dtype)
+        if self._skip_unchanged and self._reuse_variable_outputs(
+                var_name, var_suffix, manifest_key):
+            return
+
+        num_saved = len(self._processed_files.get(var_name, []))
+        da = self._open_dataarray_from_files(var_name)
+
+        # FIXME: we should ideally store train dates against the
+        #  normalisation and climatology, to ensure recalculation on
+        #  reprocess. All this need be is in the path, to be honest
 
-            da = self.pre_normalisation(var_name, da)
-            # We don't do this (https://github.com/tom-andersson/icenet2/blob/
-            # 4ca0f1300fbd82335d8bb000c85b1e71855630fa/icenet/utils.py#L520)
-            # any more
-
-            if var_name in self._linear_trends and var_suffix == "abs":
-                # TODO: verify, this used to be da = , but we should not be
-                #  overwriting the abs da with linear trend da
-                ref_da = None
-
-                if self._refdir:
-                    logging.info(
-                        "We have a reference {}, so will load "
-                        "and supply abs from that for linear trend of "
-                        "{}".format(self._refdir, var_name))
-                    ref_da = xr.open_dataarray(
-                        os.path.join(self._refdir, var_name,
-                                     "{}_{}.nc".format(var_name, var_suffix)))
-
-                self._build_linear_trend_da(da, var_name, ref_da=ref_da)
-
-            elif var_name in self._linear_trends \
-                    and var_name not in self._abs_vars:
-                raise NotImplementedError(
-                    "You've asked for linear trend "
-                    "without an  absolute value var: {}".format(var_name))
-
-            if var_name in self._no_normalise:
-                logging.info("No normalisation for {}".format(var_name))
+        if var_name in self._anom_vars:
+            if self._refdir:
+                logging.info("Loading climatology from alternate "
+                             "directory: {}".format(self._refdir))
+                clim_path = os.path.join(self._refdir, "params",
+                                         "climatology.{}".format(var_name))
             else:
-                logging.info("Normalising {}".format(var_name))
-                da = self._normalise(var_name, da)
+                clim_path = os.path.join(
+                    self.get_data_var_folder("params"),
+                    "climatology.{}".format(var_name))
+
+            if not os.path.exists(clim_path):
+                logging.info("Generating climatology {}".format(clim_path))
+
+                if self._dates.train:
+                    climatology = da.sel(time=self._train_time_indexer(da)).\
+                        groupby('time.month', restore_coord_dims=True).\
+                        mean()
+
+                    climatology.to_netcdf(clim_path)
+                else:
+                    raise RuntimeError(
+                        "{} does not exist and no "
+                        "training data is supplied".format(clim_path))
+            else:
+                logging.info("Reusing climatology {}".format(clim_path))
+                climatology = xr.open_dataarray(clim_path)
+
+            da = self.subtract_climatology(da, climatology)
+
+        # Materialise into one preallocated array of the target dtype, with
+        # dask filling it block by block, rather than computing a result to
+        # concatenate and then converting that with another full copy
+        if isinstance(da.data, dask.array.Array):
+            data = np.empty(da.shape, dtype=self._dtype)
+            dask.array.store(da.data.astype(self._dtype), data, lock=False)
+            da.data = data
+        else:
+            da.data = np.asarray(da.data, dtype=self._dtype)
+
+        da = self.pre_normalisation(var_name, da)
+        # We don't do this (https://github.com/tom-andersson/icenet2/blob/
+        # 4ca0f1300fbd82335d8bb000c85b1e71855630fa/icenet/utils.py#L520)
+        # any more
+
+        if var_name in self._linear_trends and var_suffix == "abs":
+            # TODO: verify, this used to be da = , but we should not be
+            #  overwriting the abs da with linear trend da
+            ref_da = None
+
+            if self._refdir:
+                logging.info(
+                    "We have a reference {}, so will load "
+                    "and supply abs from that for linear trend of "
+                    "{}".format(self._refdir, var_name))
+                ref_da = xr.open_dataarray(
+                    os.path.join(self._refdir, var_name,
+                                 "{}_{}.nc".format(var_name, var_suffix)))
+
+            self._build_linear_trend_da(da, var_name, ref_da=ref_da)
+
+        elif var_name in self._linear_trends \
+                and var_name not in self._abs_vars:
+            raise NotImplementedError(
+                "You've asked for linear trend "
+                "without an  absolute value var: {}".format(var_name))
+
+        if var_name in self._no_normalise:
+            logging.info("No normalisation for {}".format(var_name))
+        else:
+            logging.info("Normalising {}".format(var_name))
+            da = self._normalise(var_name, da)
+
+        da = self.post_normalisation(var_name, da)
+
+        encoding = None
+        if var_name in self._packed_vars:
+            encoding = IceNetPreProcessor.packed_encoding(da)
+
+        self.save_processed_file(var_name,
+                                 "{}_{}.nc".format(var_name, var_suffix),
+                                 da.rename("_".join([var_name, var_suffix])),
+                                 encoding=encoding)
+
+        self._write_variable_manifest(
+            var_name, var_suffix, manifest_key,
+            self._processed_files[var_name][num_saved:])
+
+    def _variable_manifest_key(self, var_name: str, var_suffix: str):
+        """
+        Hash everything that determines the processed output for a variable:
+        the source files (by path, size and modification time) and the
+        processing configuration.
+
+        :param var_name:
+        :param var_suffix:
+        :return:
+        """
+        source_files = []
+
+        for path in sorted(self._var_files.get(var_name, [])):
+            stat = os.stat(path)
+            source_files.append([path, stat.st_size, stat.st_mtime_ns])
+
+        state = dict(
+            anom=var_name in self._anom_vars,
+            data_shape=list(self._data_shape),
+            dtype=self._dtype.__name__,
+            linear_trend=var_name in self._linear_trends,
+            linear_trend_steps=self._linear_trend_steps,
+            missing_dates=sorted(str(d) for d in self._missing_dates),
+            normalise=None if var_name in self._no_normalise else
+            self._normalise.__name__,
+            packed=var_name in self._packed_vars,
+            ref_procdir=self._refdir,
+            source_files=source_files,
+            train_dates=sorted(str(d) for d in self._dates.train),
+            var_name=var_name,
+            var_suffix=var_suffix,
+        )
+        return hashlib.blake2b(json.dumps(state, sort_keys=True).encode(),
+                               digest_size=16).hexdigest()
+
+    def _reuse_variable_outputs(self, var_name: str, var_suffix: str,
+                                manifest_key: str):
+        """
+        Register the outputs of a previous run in place of reprocessing, if
+        that run recorded the same manifest key and its files still exist.
+
+        :param var_name:
+        :param var_suffix:
+        :param manifest_key:
+        :return: True if the previous outputs were reused
+        """
+        manifest_path = os.path.join(self.get_data_var_folder(var_name),
+                                     "MANIFEST.json")
+
+        if not os.path.exists(manifest_path):
+            return False
 
-            da = self.post_normalisation(var_name, da)
+        with open(manifest_path, "r") as fh:
+            entry = json.load(fh).get(var_suffix, dict())
 
-            self.save_processed_file(
-                var_name, "{}_{}.nc".format(var_name, var_suffix),
-                da.rename("_".join([var_name, var_suffix])))
+        if entry.get("key") != manifest_key or \
+                not all(os.path.exists(f) for f in entry.get("files", [])):
+            return False
+
+        logging.info("{} {} is unchanged since the last run, reusing "
+                     "{}".format(var_name, var_suffix,
+                                 ", ".join(entry["files"])))
+        var_files = self._processed_files.setdefault(var_name, list())
+        var_files.extend(f for f in entry["files"] if f not in var_files)
+        return True
+
+    def _write_variable_manifest(self, var_name: str, var_suffix: str,
+                                 manifest_key: str, files: list):
+        """
+
+        :param var_name:
+        :param var_suffix:
+        :param manifest_key:
+        :param files:
+        """
+        manifest_path = os.path.join(self.get_data_var_folder(var_name),
+                                     "MANIFEST.json")
+        manifest = dict()
+
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r") as fh:
+                manifest = json.load(fh)
+
+        manifest[var_suffix] = dict(key=manifest_key, files=list(files))
+
+        with open(manifest_path, "w") as fh:
+            json.dump(manifest, fh, indent=4)
 
     def _open_dataarray_from_files(self, var_name: str):
         """
@@ -344,6 +504,20 @@ class IceNetPreProcessor(Processor):
         :return:
         """
 
+        def rename_var(ds):
+            # For processing one file, we're going to assume a single
+            # non-lambert variable exists and rename it before combination
+            var_names = [
+                name for name in ds.data_vars.keys()
+                if not name.startswith("lambert_") and name != var_name
+            ]
+
+            if var_names:
+                logging.debug(
+                    "File has var names {} which will be renamed to {}".format(
+                        ", ".join(var_names), var_name))
+            return ds.rename({k: var_name for k in var_names})
+
         logging.info("Opening files for {}".format(var_name))
         logging.debug("Files: {}".format(self._var_files[var_name]))
         ds = xr.open_mfdataset(
@@ -355,27 +529,15 @@ class IceNetPreProcessor(Processor):
             coords="minimal",
             compat="override",
             drop_variables=("lat", "lon"),
-            parallel=self._parallel)
+            parallel=self._parallel,
+            preprocess=rename_var)
 
-        # For processing one file, we're going to assume a single non-lambert
-        # variable exists at the start and rename all of them
-        var_names = [
-            name for name in list(ds.data_vars.keys())
-            if not name.startswith("lambert_")
-        ]
-
-        var_names = set(var_names)
-        logging.debug(
-            "Files have var names {} which will be renamed to {}".format(
-                ", ".join(var_names), var_name))
-
-        ds = ds.rename({k: var_name for k in var_names})
         da = getattr(ds, var_name)
 
         # all_dates = self.dates.train + self.dates.val + self.dates.test
         # logging.debug("{} dates in total".format(len(all_dates)))
 
-        da_dates = [pd.to_datetime(d).date() for d in da.time.values]
+        da_dates = list(pd.DatetimeIndex(da.time.values).date)
         logging.debug("{} dates in da".format(len(da_dates)))
 
         # search = sorted(list(set([el for el in all_dates
@@ -405,17 +567,103 @@ class IceNetPreProcessor(Processor):
         return da
 
     @staticmethod
-    def mean_and_std(array: object):
+    def subtract_climatology(da: object, climatology: object):
+        """
+        Return the anomaly of `da` against a monthly `climatology`. If the
+        climatology does not cover every month in the data, the mean of the
+        climatology is subtracted instead.
+
+        :param da:
+        :param climatology:
+        :return:
+        """
+        data_months = da.groupby("time.month").all().month.values
+
+        if not set(data_months).issubset(set(climatology.month.values)):
+            logging.warning(
+                "We don't have a full climatology ({}) "
+                "compared with data ({})".format(
+                    ",".join([str(i) for i in climatology.month.values]),
+                    ",".join([str(i) for i in data_months])))
+            return da - climatology.mean()
+
+        # Gather the monthly climatology onto the time axis and subtract
+        # directly, avoiding a per-group binary op. Chunking by month keeps
+        # the gather lazy, in runs of same-month days
+        return da - climatology.chunk(dict(month=1)).sel(
+            month=da["time.month"])
+
+    @staticmethod
+    def packed_encoding(da: object):
+        """
+        Return NetCDF encoding that stores `da` as CF packed int16, with the
+        data range spread across the integer range, halving the size on disk
+        compared to float32. Values read back are decoded by xarray and
+        accurate to within 1/65534 of the data range.
+
+        :param da:
+        :return:
+        """
+        minimum = np.nanmin(da.data).item()
+        maximum = np.nanmax(da.data).item()
+
+        if np.isnan(minimum):
+            logging.warning("No valid data for {}, not packing".format(
+                da.name))
+            return None
+
+        # Packing attributes in the variable's float dtype, rather than
+        # float64, so the data decodes back to that dtype and not float64
+        float_type = da.dtype.type \
+            if np.issubdtype(da.dtype, np.floating) else np.float32
+
+        return dict(dtype="int16",
+                    scale_factor=float_type(
+                        (maximum - minimum) / (2**16 - 2) or 1.),
+                    add_offset=float_type((maximum + minimum) / 2),
+                    _FillValue=np.iinfo(np.int16).min)
+
+    @staticmethod
+    def mean_and_std(array: object, block_size: int = 32):
         """
         Return the mean and standard deviation of an array-like object (intended
         use case is for normalising a raw satellite data array based on a list
         of samples used for training).
+
+        The statistics are accumulated in a single pass over blocks of the
+        leading axis, merging per-block moments, so neither a flattened copy
+        nor a full-size deviations array is ever materialised.
+
         :param array:
+        :param block_size:
         :return:
+        :raises RuntimeError: if the array holds no valid (non-NaN) values
         """
 
-        mean = np.nanmean(array)
-        std = np.nanstd(array)
+        count, mean, m2 = 0, 0., 0.
+
+        for i in range(0, len(array), block_size):
+            block = np.asarray(array[i:i + block_size], dtype=np.float64)
+            valid = block[~np.isnan(block)]
+
+            if not valid.size:
+                continue
+
+            block_mean = valid.mean()
+            block_m2 = np.square(valid - block_mean).sum()
+            delta = block_mean - mean
+            total = count + valid.size
+
+            mean += delta * valid.size / total
+            m2 += block_m2 + delta ** 2 * count * valid.size / total
+            count = total
+
+        if not count:
+            raise RuntimeError("No valid values to compute the mean and "
+                               "standard deviation from")
+
+        mean = array.dtype.type(mean)
+        std = array.dtype.type(np.sqrt(m2 / count))
 
         logging.info("Mean: {:.3f}, std: {:.3f}".format(
             mean.item(), std.item()))
@@ -457,19 +705,21 @@ class IceNetPreProcessor(Processor):
         elif self._dates.train:
             logging.debug("Generating norm-average mean-std from {} training "
                           "dates".format(len(self._dates.train)))
-            training_samples = da.sel(time=self._dates.train).data
-            training_samples = training_samples.ravel()
+            training_samples = da.sel(time=self._train_time_indexer(da)).data
 
             mean, std = IceNetPreProcessor.mean_and_std(training_samples)
         else:
             raise RuntimeError("Either a normalisation file or training data "
                                "must be supplied")
 
-        new_da = (da - mean) / std
+        # The array is owned by the caller's processing pipeline, so normalise
+        # in place rather than allocating a temporary for each operation
+        da -= mean
+        da /= std
 
         if not self._refdir:
             open(mean_path, "w").write(",".join([str(f) for f in [mean, std]]))
-        return new_da
+        return da
 
     def _normalise_array_scaling(self, var_name: str, da: object):
         """
@@ -497,7 +747,7 @@ class IceNetPreProcessor(Processor):
         elif self._dates.train:
             logging.debug("Generating norm-scaling min-max from {} training "
                           "dates".format(len(self._dates.train)))
-            training_samples = da.sel(time=self._dates.train).data
+            training_samples = da.sel(time=self._train_time_indexer(da)).data
             training_samples = training_samples.ravel()
 
             minimum = np.nanmin(training_samples).astype(self._dtype)
@@ -506,11 +756,13 @@ class IceNetPreProcessor(Processor):
             raise RuntimeError("Either a normalisation file or training data "
                                "must be supplied")
 
-        new_da = (da - minimum) / (maximum - minimum)
+        da -= minimum
+        da /= maximum - minimum
+
         if not self._refdir:
             open(scale_path,
                  "w").write(",".join([str(f) for f in [minimum, maximum]]))
-        return new_da
+        return da
 
     def _build_linear_trend_da(self,
                                input_da: object,
@@ -527,25 +779,27 @@ class IceNetPreProcessor(Processor):
         :param ref_da:
         :return:
         """
+        # Imported here as icenet.model pulls in TensorFlow, which the rest
+        # of preprocessing does not need
+        from icenet.model.models import linear_trend_forecast
 
         if ref_da is None:
             ref_da = input_da
-        data_dates = sorted(
-            [pd.Timestamp(date) for date in input_da.time.values])
+        data_index = pd.DatetimeIndex(input_da.time.values).sort_values()
+        data_dates = list(data_index)
 
-        trend_dates = set()
         trend_steps = max(self._linear_trend_steps)
         logging.info(
             "Generating trend data up to {} steps ahead for {} dates".format(
                 trend_steps, len(data_dates)))
 
-        for dat_date in data_dates:
-            trend_dates = trend_dates.union([
-                dat_date + pd.DateOffset(days=d)
-                for d in self._linear_trend_steps
-            ])
-
-        trend_dates = list(sorted(trend_dates))
+        trend_dates = list(
+            pd.DatetimeIndex(
+                np.add.outer(
+                    data_index.values,
+                    pd.to_timedelta(self._linear_trend_steps,
+                                    unit="D").values).ravel()).unique().
+            sort_values())
         logging.info("Generating {} trend dates".format(len(trend_dates)))
 
         linear_trend_da = \
@@ -580,9 +834,17 @@ class IceNetPreProcessor(Processor):
                 isel(time=slice(0, max_years))
             return date_da
 
-        for forecast_date in sorted(trend_dates, reverse=True):
-            if not trend_cache.sel(time=forecast_date).isnull().all():
-                output_map = trend_cache.sel(time=forecast_date)
+        # trend_dates is sorted and matches linear_trend_da's time axis, so
+        # resolve positions once rather than label-indexing every step
+        cache_idx = trend_cache.indexes["time"].get_indexer(trend_dates)
+
+        for idx in reversed(range(len(trend_dates))):
+            forecast_date = trend_dates[idx]
+            cached_map = trend_cache[dict(time=cache_idx[idx])] \
+                if cache_idx[idx] >= 0 else None
+
+            if cached_map is not None and not cached_map.isnull().all():
+                output_map = cached_map
             else:
                 output_map = linear_trend_forecast(
                     data_selector,
@@ -592,7 +854,7 @@ class IceNetPreProcessor(Processor):
                     missing_dates=self._missing_dates,
                     shape=self._data_shape)
 
-            linear_trend_da.loc[dict(time=forecast_date)] = output_map
+            linear_trend_da[dict(time=idx)] = output_map
 
         logging.info("Writing new trend cache for {}".format(var_name))
         trend_cache.close()
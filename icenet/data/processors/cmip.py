@@ -53,10 +53,13 @@ def main():
         linear_trends=args.trends,
         linear_trend_days=args.trend_lead,
         north=args.hemisphere == "north",
+        packed_vars=args.packed_vars,
         parallel_opens=args.parallel_opens,
         ref_procdir=args.ref,
+        skip_unchanged=args.skip_unchanged,
         south=args.hemisphere == "south",
         update_key=args.update_key,
+        workers=args.workers,
     )
     cmip.init_source_data(lag_days=args.lag,)
     cmip.process()
@@ -82,28 +82,24 @@ class IceNetMetaPreProcessor(IceNetPreProcessor):
         """
 
         """
-        cos = []
-        sin = []
-        paths = []
+        dates = pd.date_range(start='2012-1-1', end='2012-12-31')
+        circday = dates.dayofyear.values.astype(np.float64)
 
-        for date in pd.date_range(start='2012-1-1', end='2012-12-31'):
-            if self.north:
-                circday = date.dayofyear
-            else:
-                circday = date.dayofyear + 365.25 / 2
+        if not self.north:
+            circday += 365.25 / 2
 
-            cos.append(np.cos(2 * np.pi * circday / 366, dtype=self._dtype))
-            sin.append(np.sin(2 * np.pi * circday / 366, dtype=self._dtype))
+        theta = 2 * np.pi * circday / 366
+        paths = []
 
-        for var_name in ["sin", "cos"]:
+        for var_name, data in (("sin", np.sin(theta, dtype=self._dtype)),
+                               ("cos", np.cos(theta, dtype=self._dtype))):
             if var_name not in self._meta_vars:
                 self._meta_vars.append(var_name)
 
             da = xr.DataArray(
-                data=eval(var_name),
+                data=data,
                 dims=["time"],
-                coords=dict(
-                    time=pd.date_range(start='2012-1-1', end='2012-12-31')),
+                coords=dict(time=dates),
                 attrs=dict(
                     description="IceNet {} mask metadata".format(var_name)))
             paths.append(
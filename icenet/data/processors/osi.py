@@ -61,8 +61,11 @@ def main():
                                 linear_trends=args.trends,
                                 linear_trend_steps=args.trend_lead,
                                 north=args.hemisphere == "north",
+                                packed_vars=args.packed_vars,
                                 parallel_opens=args.parallel_opens,
                                 ref_procdir=args.ref,
-                                south=args.hemisphere == "south")
+                                skip_unchanged=args.skip_unchanged,
+                                south=args.hemisphere == "south",
+                                workers=args.workers)
     osi.init_source_data(lag_days=args.lag,)
     osi.process()
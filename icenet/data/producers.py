@@ -2,10 +2,8 @@ from abc import abstractmethod, ABCMeta
 
 import collections
 import datetime as dt
-import glob
 import logging
 import os
-import re
 
 import pandas as pd
 
@@ -254,6 +252,28 @@ class Processor(DataProducer):
 
         var_files = {}
 
+        # Equivalent to globbing "**/[12]*.nc", but os.walk is backed by
+        # os.scandir, so the filter runs on directory entries directly
+        logging.debug("Scanning source files from {}".format(
+            self.source_data))
+        dfs = []
+
+        for root, dirs, files in os.walk(self.source_data, followlinks=True):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            dfs.extend(
+                os.path.join(root, f)
+                for f in files
+                if f.startswith(("1", "2")) and f.endswith(".nc"))
+        logging.debug("Found {} files".format(len(dfs)))
+
+        # FIXME: using hyphens broadly no?
+        data_dates = [
+            df.split(os.sep)[-1][:-3].replace("_", "-") for df in dfs
+        ]
+        dt_series = pd.Series(dfs, index=data_dates)
+
+        logging.debug("Create structure of {} files".format(len(dt_series)))
+
         for date_category in ["train", "val", "test"]:
             dates = sorted(getattr(self._dates, date_category))
 
@@ -265,7 +285,6 @@ class Processor(DataProducer):
                     "No {} dates for this processor".format(date_category))
                 continue
 
-            # TODO: ProcessPool for this (avoid the GIL for globbing)
             # FIXME: needs to deal with a lack of continuity in the date ranges
             if lag_days:
                 logging.info("Including lag of {} days".format(lag_days))
@@ -295,21 +314,6 @@ class Processor(DataProducer):
                             additional_lead_dates.append(lead_day)
                 dates += list(set(additional_lead_dates))
 
-            globstr = "{}/**/[12]*.nc".format(self.source_data)
-
-            logging.debug("Globbing {} from {}".format(date_category, globstr))
-            dfs = glob.glob(globstr, recursive=True)
-            logging.debug("Globbed {} files".format(len(dfs)))
-
-            # FIXME: using hyphens broadly no?
-            data_dates = [
-                df.split(os.sep)[-1][:-3].replace("_", "-") for df in dfs
-            ]
-            dt_series = pd.Series(dfs, index=data_dates)
-
-            logging.debug("Create structure of {} files".format(
-                len(dt_series)))
-
             # Ensure we're ordered, it has repercussions for xarray
             for date in sorted(dates):
                 try:
@@ -323,17 +327,15 @@ class Processor(DataProducer):
                     match_dfs = []
 
                 for df in match_dfs:
-                    if any([
-                            flt in os.path.split(df)[1]
-                            for flt in self._file_filters
-                    ]):
+                    if any(flt in os.path.split(df)[1]
+                           for flt in self._file_filters):
                         continue
 
                     path_comps = str(os.path.split(df)[0]).split(os.sep)
                     var = path_comps[-1]
 
                     # The year is in the path, fall back one further
-                    if re.match(r'^\d{4}$', var):
+                    if len(var) == 4 and var.isdigit():
                         var = path_comps[-2]
 
                     if var not in var_files.keys():
@@ -358,7 +360,11 @@ class Processor(DataProducer):
         raise NotImplementedError("{}.process is abstract".format(
             __class__.__name__))
 
-    def save_processed_file(self, var_name: str, name: str, data: object,
+    def save_processed_file(self,
+                            var_name: str,
+                            name: str,
+                            data: object,
+                            encoding: dict = None,
                             **kwargs) -> str:
         """Save processed data to netCDF file.
 
@@ -366,6 +372,8 @@ class Processor(DataProducer):
             var_name: The name of the variable.
             name: The name of the file.
             data: The data to be saved.
+            encoding (optional): NetCDF encoding for the named data variable.
+                Defaults to None.
             **kwargs: Additional keyword arguments to be passed to the
                 `get_data_var_folder` method.
 
@@ -374,7 +382,19 @@ class Processor(DataProducer):
         """
         file_path = os.path.join(self.get_data_var_folder(var_name, **kwargs),
                                  name)
-        data.to_netcdf(file_path)
+
+        # Consumers read these files one date at a time, so lay each time
+        # step out as its own chunk in a single write rather than leaving
+        # the layout to the backend
+        encoding = dict(encoding) if encoding else dict()
+        if getattr(data, "name", None) and "time" in data.dims \
+                and data.ndim > 1:
+            encoding.setdefault(
+                "chunksizes",
+                tuple(1 if dim == "time" else size
+                      for dim, size in zip(data.dims, data.shape)))
+        data.to_netcdf(file_path,
+                       encoding={data.name: encoding} if encoding else None)
 
         if var_name not in self._processed_files.keys():
             self._processed_files[var_name] = list()
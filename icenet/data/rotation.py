@@ -0,0 +1,38 @@
+import numpy as np
+
+
+def rotate_vector_arrays(uu: object, vv: object, angles: object, x_dim: int,
+                         y_dim: int, angles_x_dim: int, angles_y_dim: int):
+    """
+    Rotate grid relative vector components by the grid cell angles, for any
+    number of spatial fields in one go by broadcasting the angles over the
+    non-spatial axes. This is the array core of
+    :func:`icenet.data.utils.rotate_grid_vectors`, kept free of iris.
+
+    :param uu: u component array, possibly masked
+    :param vv: v component array, possibly masked
+    :param angles: 2D grid cell angles in radians
+    :param x_dim: position of the X dimension in `uu` and `vv`
+    :param y_dim: position of the Y dimension in `uu` and `vv`
+    :param angles_x_dim: position of the X dimension in `angles`
+    :param angles_y_dim: position of the Y dimension in `angles`
+    :return: tuple of rotated u and v masked arrays
+    """
+    # line the angles up with the source dimensions, which need not be in
+    # the same order, and leave length one axes for broadcasting over
+    # everything else
+    aa = np.asarray(angles)
+    if (angles_y_dim < angles_x_dim) != (y_dim < x_dim):
+        aa = aa.T
+    aa = np.expand_dims(
+        aa, tuple(d for d in range(np.ndim(uu)) if d not in (x_dim, y_dim)))
+
+    cos_a, sin_a = np.cos(aa), np.sin(aa)
+    u_r = uu * cos_a - vv * sin_a
+    v_r = uu * sin_a + vv * cos_a
+
+    # as with iris, mask invalid angles along with any masked source values
+    mask = np.isnan(aa) | np.ma.getmaskarray(uu) | np.ma.getmaskarray(vv)
+
+    return np.ma.masked_array(u_r, mask=mask), \
+        np.ma.masked_array(v_r, mask=mask)
@@ -53,6 +53,7 @@ class Masks(Generator):
         self._dtype = dtype
         self._shape = data_shape
         self._region = (slice(None, None), slice(None, None))
+        self._mask_cache = dict()
 
         self.init_params()
 
@@ -223,7 +224,7 @@ class Masks(Generator):
                                "want to address this!")
 
         # logging.debug("Loading active cell mask {}".format(mask_path))
-        return np.load(mask_path)[self._region]
+        return self._load_mask(mask_path)[self._region]
 
     def get_active_cell_da(self, src_da: object) -> object:
         """Generate an xarray.DataArray object containing the active cell masks
@@ -239,8 +240,8 @@ class Masks(Generator):
         """
         return xr.DataArray(
             [
-                self.get_active_cell_mask(pd.to_datetime(date).month)
-                for date in src_da.time.values
+                self.get_active_cell_mask(month)
+                for month in pd.DatetimeIndex(src_da.time.values).month
             ],
             dims=('time', 'yc', 'xc'),
             coords={
@@ -270,8 +271,26 @@ class Masks(Generator):
                                "not done automatically so you might want to "
                                "address this!")
 
-        # logging.debug("Loading land mask {}".format(mask_path))
-        return np.load(mask_path)[self._region]
+        return self._load_mask(mask_path)[self._region]
+
+    def _load_mask(self, mask_path: str) -> object:
+        """Loads a mask file, caching it for the lifetime of this instance.
+
+        Masks are immutable once generated, so the array is marked read-only
+        and shared between callers rather than being reloaded each time.
+
+        Args:
+            mask_path: Path to the numpy mask file.
+
+        Returns:
+            A read-only numpy array of the whole mask.
+        """
+        if mask_path not in self._mask_cache:
+            logging.debug("Loading mask {}".format(mask_path))
+            mask = np.load(mask_path)
+            mask.setflags(write=False)
+            self._mask_cache[mask_path] = mask
+        return self._mask_cache[mask_path]
 
     def get_polarhole_mask(self, date: object) -> object:
         """Get mask of polar hole region.
@@ -289,7 +308,7 @@ class Masks(Generator):
                     self.get_data_var_folder("masks"),
                     "polarhole{}_mask.npy".format(i + 1))
                 # logging.debug("Loading polarhole {}".format(polarhole_path))
-                return np.load(polarhole_path)[self._region]
+                return self._load_mask(polarhole_path)[self._region]
         return None
 
     def get_blank_mask(self) -> object:
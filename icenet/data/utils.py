@@ -6,6 +6,8 @@ import cf_units
 import iris
 import numpy as np
 
+from icenet.data.rotation import rotate_vector_arrays
+
 
 def assign_lat_lon_coord_system(cube: object):
     """Assign coordinate system to iris cube to allow regridding.
@@ -32,9 +34,10 @@ def rotate_grid_vectors(u_cube: object, v_cube: object, angles: object):
     """
     Author: Tony Phillips (BAS)
 
-    Wrapper for :func:`~iris.analysis.cartography.rotate_grid_vectors`
-    that can rotate multiple masked spatial fields in one go by iterating
-    over the horizontal spatial axes in slices
+    Equivalent of :func:`~iris.analysis.cartography.rotate_grid_vectors`
+    that can rotate multiple masked spatial fields in one go by broadcasting
+    the grid angles over the non-spatial axes, rather than rotating and
+    merging each horizontal slice in turn
 
     :param u_cube:
     :param v_cube:
@@ -42,29 +45,23 @@ def rotate_grid_vectors(u_cube: object, v_cube: object, angles: object):
     :return:
 
     """
-    # lists to hold slices of rotated vectors
-    u_r_all = iris.cube.CubeList()
-    v_r_all = iris.cube.CubeList()
-
-    # get the X and Y dimension coordinates for each source cube
-    u_xy_coords = [
-        u_cube.coord(axis='x', dim_coords=True),
-        u_cube.coord(axis='y', dim_coords=True)
-    ]
-    v_xy_coords = [
-        v_cube.coord(axis='x', dim_coords=True),
-        v_cube.coord(axis='y', dim_coords=True)
-    ]
-
-    # iterate over X, Y slices of the source cubes, rotating each in turn
-    for u, v in zip(u_cube.slices(u_xy_coords, ordered=False),
-                    v_cube.slices(v_xy_coords, ordered=False)):
-        u_r, v_r = iris.analysis.cartography.rotate_grid_vectors(u, v, angles)
-        u_r_all.append(u_r)
-        v_r_all.append(v_r)
-
-    # return the slices, merged back together into a pair of cubes
-    return u_r_all.merge_cube(), v_r_all.merge_cube()
+    # get the positions of the X and Y dimensions of the source cubes and
+    # of the angles, which need not be in the same order
+    x_dim, = u_cube.coord_dims(u_cube.coord(axis='x', dim_coords=True))
+    y_dim, = u_cube.coord_dims(u_cube.coord(axis='y', dim_coords=True))
+    angles_x_dim, = angles.coord_dims(angles.coord(axis='x', dim_coords=True))
+    angles_y_dim, = angles.coord_dims(angles.coord(axis='y', dim_coords=True))
+
+    angles = angles.copy()
+    angles.convert_units("radians")
+
+    u_r, v_r = rotate_vector_arrays(u_cube.data, v_cube.data, angles.data,
+                                    x_dim, y_dim, angles_x_dim, angles_y_dim)
+
+    u_out, v_out = u_cube.copy(), v_cube.copy()
+    u_out.data = u_r
+    v_out.data = v_r
+    return u_out, v_out
 
 
 def gridcell_angles_from_dim_coords(cube: object):
@@ -101,20 +98,11 @@ def gridcell_angles_from_dim_coords(cube: object):
     nx = x_bounds.shape[0]
     ny = y_bounds.shape[0]
 
-    # make arrays to hold the ordered X and Y bound coordinates
-    x = np.zeros((ny, nx, 4))
-    y = np.zeros((ny, nx, 4))
-
-    # iterate over the bounds (in order BL, BR, TL, TR), mesh them and
-    # put them into the X and Y bound coordinates (in order BL, BR, TR, TL)
-    c = [0, 1, 3, 2]
-    cind = 0
-    for yi in [0, 1]:
-        for xi in [0, 1]:
-            xy = np.meshgrid(x_bounds[:, xi], y_bounds[:, yi])
-            x[:, :, c[cind]] = xy[0]
-            y[:, :, c[cind]] = xy[1]
-            cind += 1
+    # broadcast the bounds (in order BL, BR, TR, TL) into the ordered X and Y
+    # bound coordinates, as read-only views that are only copied when the
+    # points are flattened for transformation
+    x = np.broadcast_to(x_bounds[np.newaxis, :, [0, 1, 1, 0]], (ny, nx, 4))
+    y = np.broadcast_to(y_bounds[:, np.newaxis, [0, 0, 1, 1]], (ny, nx, 4))
 
     # convert the X and Y coordinates to longitudes and latitudes
     source_crs = cube.coord_system().as_cartopy_crs()
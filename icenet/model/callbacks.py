@@ -1,3 +1,5 @@
+import operator
+
 import numpy as np
 import tensorflow as tf
 
@@ -49,8 +51,8 @@ class IceNetPreTrainingEvaluator(tf.keras.callbacks.Callback):
                                            return_dict=True)
             val_logs = {'val_' + name: val for name, val in val_logs.items()}
             logs.update(val_logs)
-            [tf.print('\n' + k + ' {:.2f}'.format(v)) for k, v in logs.items()]
-            tf.print('\n')
+            tf.print("".join(
+                "\n{} {:.2f}".format(k, v) for k, v in logs.items()) + "\n\n")
 
 
 class BatchwiseModelCheckpoint(tf.keras.callbacks.Callback):
@@ -78,41 +80,40 @@ class BatchwiseModelCheckpoint(tf.keras.callbacks.Callback):
         self.monitor = monitor
         self.sample_at_zero = sample_at_zero
 
+        # Resolve the mode once, rather than comparing strings every batch
+        if self.mode == 'max':
+            self._improved = operator.gt
+            self.best = -np.inf
+        elif self.mode == 'min':
+            self._improved = operator.lt
+            self.best = np.inf
+        else:
+            raise ValueError("Unknown mode {}, should be max or min".format(
+                self.mode))
+
         if prev_best is not None:
             self.best = prev_best
 
-        else:
-            if self.mode == 'max':
-                self.best = -np.Inf
-            elif self.mode == 'min':
-                self.best = np.Inf
-
     def on_train_batch_end(self, batch: object, logs: object = None):
         """
 
         :param batch:
         :param logs:
         """
-        if (batch == 0 and self.sample_at_zero) \
-                or (batch + 1) % self.save_frequency == 0:
-            if self.mode == 'max' and logs[self.monitor] > self.best:
-                save = True
+        if not ((batch == 0 and self.sample_at_zero)
+                or (batch + 1) % self.save_frequency == 0):
+            return
 
-            elif self.mode == 'min' and logs[self.monitor] < self.best:
-                save = True
+        current = logs[self.monitor]
 
-            else:
-                save = False
+        if self._improved(current, self.best):
+            tf.print('\n{} improved from {:.3f} to {:.3f}. '
+                     'Saving model to {}.\n'.format(self.monitor, self.best,
+                                                    current, self.model_path))
 
-            if save:
-                tf.print('\n{} improved from {:.3f} to {:.3f}. '
-                         'Saving model to {}.\n'.format(self.monitor, self.best,
-                                                        logs[self.monitor],
-                                                        self.model_path))
+            self.best = current
 
-                self.best = logs[self.monitor]
-
-                self.model.save(self.model_path, overwrite=True)
-            else:
-                tf.print('\n{}={:.3f} did not improve from {:.3f}\n'.format(
-                    self.monitor, logs[self.monitor], self.best))
+            self.model.save(self.model_path, overwrite=True)
+        else:
+            tf.print('\n{}={:.3f} did not improve from {:.3f}\n'.format(
+                self.monitor, current, self.best))
@@ -4,6 +4,8 @@ import logging
 import os
 import re
 
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pandas as pd
 import tensorflow as tf
@@ -70,14 +72,29 @@ def predict_forecast(
 
     if not test_set:
         logging.info("Generating forecast inputs from processed/ files")
-
-        for date in start_dates:
-            data_sample = dl.generate_sample(date, prediction=True)
-            run_prediction(network=network,
-                           date=date,
-                           output_folder=output_folder,
-                           data_sample=data_sample,
-                           save_args=save_args)
+        start_dates = list(start_dates)
+
+        # Generating a sample is I/O bound, so prepare the next one in the
+        # background while the network runs on the current one
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            next_sample = executor.submit(dl.generate_sample,
+                                          start_dates[0],
+                                          prediction=True) \
+                if start_dates else None
+
+            for i, date in enumerate(start_dates):
+                data_sample = next_sample.result()
+
+                if i + 1 < len(start_dates):
+                    next_sample = executor.submit(dl.generate_sample,
+                                                  start_dates[i + 1],
+                                                  prediction=True)
+
+                run_prediction(network=network,
+                               date=date,
+                               output_folder=output_folder,
+                               data_sample=data_sample,
+                               save_args=save_args)
     else:
         # TODO: This is horrible behaviour, rethink and refactor: we should
         #  be able to pull from the test set in a nicer and more efficient
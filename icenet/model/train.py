@@ -316,6 +316,16 @@ def get_args():
                     default=False,
                     action="store_true",
                     help="Shuffle the training set")
+    ap.add_argument("--shuffle-buffer",
+                    default=None,
+                    type=int,
+                    help="Training records to mix when shuffling, defaults "
+                    "to the batch size per training file, up to 366")
+    ap.add_argument("--shuffle-cycle-length",
+                    default=None,
+                    type=int,
+                    help="Training files to interleave when shuffling, "
+                    "defaults to the batch size")
     ap.add_argument("--gpus", default=None)
     ap.add_argument("-v", "--verbose", action="store_true", default=False)
     ap.add_argument("-w", "--workers", type=int, default=4)
@@ -369,14 +379,19 @@ def main():
     if len(args.additional) == 0:
         dataset = IceNetDataSet("dataset_config.{}.json".format(args.dataset),
                                 batch_size=args.batch_size,
-                                shuffling=args.shuffle_train)
+                                shuffling=args.shuffle_train,
+                                shuffle_buffer=args.shuffle_buffer,
+                                shuffle_cycle_length=args.shuffle_cycle_length)
     else:
-        dataset = MergedIceNetDataSet([
-            "dataset_config.{}.json".format(el)
-            for el in [args.dataset, *args.additional]
-        ],
-                                      batch_size=args.batch_size,
-                                      shuffling=args.shuffle_train)
+        dataset = MergedIceNetDataSet(
+            [
+                "dataset_config.{}.json".format(el)
+                for el in [args.dataset, *args.additional]
+            ],
+            batch_size=args.batch_size,
+            shuffling=args.shuffle_train,
+            shuffle_buffer=args.shuffle_buffer,
+            shuffle_cycle_length=args.shuffle_cycle_length)
 
     strategy = tf.distribute.MirroredStrategy() \
         if args.strategy == "mirrored" \
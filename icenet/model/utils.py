@@ -1,4 +1,6 @@
 import logging
+import math
+
 import numpy as np
 import matplotlib.pyplot as plt
 
@@ -17,6 +19,7 @@ def make_exp_decay_lr_schedule(rate: float,
     :param end_epoch:
     :return:
     """
+    decay = math.exp(-rate)
 
     def lr_scheduler_exp_decay(epoch, lr):
         """ Learning rate scheduler for fine tuning.
@@ -27,7 +30,7 @@ def make_exp_decay_lr_schedule(rate: float,
         """
 
         if start_epoch < epoch < end_epoch:
-            lr = lr * np.math.exp(-rate)
+            lr = lr * decay
 
         logging.info('\nSetting learning rate to: {}\n'.format(lr))
 
@@ -41,8 +41,10 @@ def plot_tfrecord():
     config = json.load(args.configuration)
     args.configuration.close()
 
-    decoder = get_decoder(tuple(config['shape']), config['num_channels'],
-                          config['n_forecast_days'])
+    decoder = get_decoder(tuple(config['shape']),
+                          config['num_channels'],
+                          config['n_forecast_days'],
+                          storage_dtype=config.get('storage_dtype', None))
 
     ds = ds.map(decoder).batch(1)
     it = ds.as_numpy_iterator()
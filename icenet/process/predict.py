@@ -60,6 +60,39 @@ def get_refcube(north: bool = True, south: bool = False) -> object:
     return cube
 
 
+def load_npy_into(path: str, out: object) -> object:
+    """
+    Read a .npy file straight into the preallocated array `out`, avoiding
+    the intermediate array np.load would allocate. Falls back to np.load if
+    the stored shape, dtype or ordering do not match `out`.
+
+    :param path:
+    :param out:
+    :return:
+    """
+    header_readers = {
+        (1, 0): np.lib.format.read_array_header_1_0,
+        (2, 0): np.lib.format.read_array_header_2_0,
+    }
+
+    with open(path, "rb") as fh:
+        version = np.lib.format.read_magic(fh)
+
+        # Other format versions, e.g. 3.0 with its UTF-8 header, have no
+        # public header reader so are left to np.load
+        if version in header_readers:
+            shape, fortran_order, dtype = header_readers[version](fh)
+
+            if shape == out.shape and dtype == out.dtype and \
+                    not fortran_order and not dtype.hasobject and \
+                    out.flags.c_contiguous:
+                if fh.readinto(memoryview(out).cast("B")) == out.nbytes:
+                    return out
+
+    out[...] = np.load(path)
+    return out
+
+
 def get_prediction_data(root: object, name: object, date: object) -> tuple:
     """
 
@@ -78,8 +111,13 @@ def get_prediction_data(root: object, name: object, date: object) -> tuple:
         logging.warning("No files found")
         return None
 
-    data = [np.load(f) for f in np_files]
-    data = np.array(data)
+    # Load every ensemble member straight into one preallocated array
+    template = np.load(np_files[0], mmap_mode="r")
+    data = np.empty((len(np_files), *template.shape), dtype=template.dtype)
+    del template
+
+    for idx, np_file in enumerate(np_files):
+        load_npy_into(np_file, data[idx])
     ens_members = data.shape[0]
 
     logging.debug("Data read from disk: {} from: {}".format(
@@ -0,0 +1,97 @@
+"""Tests for `icenet.data.utils`"""
+
+import numpy as np
+import pytest
+
+iris = pytest.importorskip("iris")
+utils = pytest.importorskip("icenet.data.utils")
+
+import iris.analysis.cartography  # noqa: E402
+import iris.coord_systems  # noqa: E402
+import iris.coords  # noqa: E402
+import iris.cube  # noqa: E402
+
+
+def make_wind_cubes(transpose_xy: bool):
+    """Build non-square u and v cubes on a projected grid
+
+    :param transpose_xy: give the cubes (time, x, y) rather than
+        (time, y, x) dimensions
+    :return: tuple of u and v cubes
+    """
+    crs = iris.coord_systems.LambertAzimuthalEqualArea(
+        latitude_of_projection_origin=90,
+        ellipsoid=iris.coord_systems.GeogCS(6378137.0))
+    x = iris.coords.DimCoord(np.linspace(-2e6, 2e6, 5),
+                             "projection_x_coordinate",
+                             units="m",
+                             coord_system=crs)
+    y = iris.coords.DimCoord(np.linspace(-1e6, 1e6, 3),
+                             "projection_y_coordinate",
+                             units="m",
+                             coord_system=crs)
+    t = iris.coords.DimCoord(np.arange(2.),
+                             "time",
+                             units="days since 2000-01-01")
+
+    rng = np.random.default_rng(42)
+    cubes = []
+
+    for name in ("uas", "vas"):
+        cube = iris.cube.Cube(rng.normal(size=(2, 3, 5)),
+                              var_name=name,
+                              units="m s-1",
+                              dim_coords_and_dims=[(t, 0), (y, 1), (x, 2)])
+        if transpose_xy:
+            cube.transpose([0, 2, 1])
+        cubes.append(cube)
+    return tuple(cubes)
+
+
+def iris_rotate(u_cube, v_cube, angles):
+    """Reference rotation, one time slice at a time with iris
+
+    :param u_cube:
+    :param v_cube:
+    :param angles:
+    :return: tuple of rotated u and v masked arrays
+    """
+    u_r, v_r = [], []
+
+    for u, v in zip(u_cube.slices_over("time"), v_cube.slices_over("time")):
+        slice_angles = angles.copy()
+        angles_x = slice_angles.coord(axis='x', dim_coords=True)
+        u_x = u.coord(axis='x', dim_coords=True)
+        if slice_angles.coord_dims(angles_x) != u.coord_dims(u_x):
+            slice_angles.transpose()
+
+        u_rot, v_rot = iris.analysis.cartography.rotate_grid_vectors(
+            u, v, slice_angles)
+        u_r.append(u_rot.data)
+        v_r.append(v_rot.data)
+    return np.ma.stack(u_r), np.ma.stack(v_r)
+
+
+@pytest.mark.parametrize("transpose_angles", [False, True])
+@pytest.mark.parametrize("transpose_xy", [False, True])
+def test_rotate_grid_vectors_matches_iris(transpose_xy, transpose_angles):
+    """Rotating whole cubes matches iris for either dimension order of the
+    data and of the angles on a non-square grid
+    """
+    u_cube, v_cube = make_wind_cubes(transpose_xy)
+    angles = utils.gridcell_angles_from_dim_coords(u_cube)
+    if transpose_angles:
+        angles.transpose()
+
+    u_expected, v_expected = iris_rotate(u_cube, v_cube, angles)
+    u_r, v_r = utils.rotate_grid_vectors(u_cube, v_cube, angles)
+
+    assert u_r.shape == u_cube.shape
+    np.testing.assert_allclose(np.ma.getdata(u_r.data),
+                               np.ma.getdata(u_expected),
+                               atol=1e-12)
+    np.testing.assert_allclose(np.ma.getdata(v_r.data),
+                               np.ma.getdata(v_expected),
+                               atol=1e-12)
+    np.testing.assert_array_equal(np.ma.getmaskarray(u_r.data),
+                                  np.ma.getmaskarray(u_expected))
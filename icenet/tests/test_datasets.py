@@ -0,0 +1,43 @@
+"""Tests for `icenet.data.datasets`"""
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from icenet.data.datasets.utils import get_decoder
+from icenet.data.loaders.utils import write_tfrecord
+
+
+@pytest.mark.parametrize("batch_size", [None, 2])
+def test_decode_float16_records(tmp_path, batch_size):
+    rng = np.random.default_rng(0)
+    samples = [(rng.random((3, 4, 5)).astype(np.float32),
+                rng.random((3, 4, 2, 1)).astype(np.float32),
+                rng.random((3, 4, 2, 1)).astype(np.float32))
+               for _ in range(3)]
+    path = str(tmp_path / "00000000.tfrecord")
+
+    with tf.io.TFRecordWriter(path) as writer:
+        for x, y, sample_weights in samples:
+            write_tfrecord(writer, x, y, sample_weights,
+                           storage_dtype="float16")
+
+    ds = tf.data.TFRecordDataset([path])
+    if batch_size:
+        ds = ds.batch(batch_size)
+    ds = ds.map(get_decoder((3, 4), 5, 2, storage_dtype="float16"))
+
+    decoded = [[arr.numpy() for arr in item] for item in ds]
+    if batch_size:
+        assert decoded[0][0].shape == (batch_size, 3, 4, 5)
+        decoded = [[arr[i] for arr in item]
+                   for item in decoded
+                   for i in range(len(item[0]))]
+
+    assert len(decoded) == len(samples)
+    for item, sample in zip(decoded, samples):
+        for arr, expected in zip(item, sample):
+            assert arr.shape == expected.shape
+            assert arr.dtype == np.float32
+            np.testing.assert_array_equal(
+                arr, expected.astype(np.float16).astype(np.float32))
@@ -0,0 +1,75 @@
+"""Tests for `icenet.data.interfaces.downloader`"""
+
+import datetime as dt
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from icenet.data.interfaces.downloader import filter_dates_on_data
+from icenet.data.interfaces.esgf import CMIP6Downloader
+
+
+@pytest.fixture
+def downloader(tmp_path, monkeypatch):
+    # Downloaders set up their masks relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    return CMIP6Downloader(source="MRI-ESM2-0",
+                           member="r1i1p1f1",
+                           var_names=["tas"],
+                           levels=[None],
+                           path=str(tmp_path / "data"),
+                           no_cache=True)
+
+
+def write_latlon(path, dates):
+    xr.DataArray(np.zeros((len(dates), 2, 2)),
+                 dims=("time", "lat", "lon"),
+                 coords=dict(time=dates),
+                 name="tas").to_netcdf(path)
+
+
+def test_planned_checks_answer_from_the_listing(downloader, monkeypatch):
+    dates = [dt.date(2020, 1, 1), dt.date(2020, 1, 2)]
+    var_folder = downloader.get_data_var_folder("tas")
+    latlon_path, regridded_name = downloader.get_req_filenames(
+        var_folder, dates[0])
+    write_latlon(latlon_path, pd.to_datetime(dates[:1]))
+
+    downloader._preflight = downloader._plan([("tas", None, dates)])
+
+    def no_stat(path):
+        raise AssertionError("{} was checked on disk".format(path))
+
+    monkeypatch.setattr(os.path, "exists", no_stat)
+
+    # Both existing and missing files are answered from the listing
+    assert downloader._planned_exists(latlon_path)
+    assert not downloader._planned_exists(regridded_name)
+
+    req_dates = filter_dates_on_data(latlon_path,
+                                     regridded_name,
+                                     dates,
+                                     exists=downloader._planned_exists)
+    assert req_dates == [pd.Timestamp(dates[1])]
+
+    # Files written during the download are added to the listing
+    downloader._record_planned(regridded_name)
+    assert downloader._planned_exists(regridded_name)
+
+
+def test_filter_dates_on_data_uses_exists(tmp_path):
+    dates = [dt.date(2020, 1, 1), dt.date(2020, 1, 2)]
+    latlon_path = str(tmp_path / "latlon_2020.nc")
+    write_latlon(latlon_path, pd.to_datetime(dates))
+
+    assert filter_dates_on_data(latlon_path,
+                                str(tmp_path / "2020.nc"),
+                                dates) == []
+    assert filter_dates_on_data(latlon_path,
+                                str(tmp_path / "2020.nc"),
+                                dates,
+                                exists=lambda path: False) == \
+        list(pd.to_datetime(dates))
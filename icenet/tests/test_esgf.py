@@ -0,0 +1,102 @@
+"""Tests for `icenet.data.interfaces.esgf`"""
+
+import os
+import threading
+
+import pytest
+import requests
+
+from icenet.data.interfaces import esgf
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    # Downloaders set up their masks relative to the working directory
+    monkeypatch.chdir(tmp_path)
+
+
+def make_downloader(tmp_path, **kwargs):
+    return esgf.CMIP6Downloader(source="MRI-ESM2-0",
+                                member="r1i1p1f1",
+                                var_names=["tas"],
+                                levels=[None],
+                                path=str(tmp_path / "data"),
+                                cache_path=str(tmp_path / "cache"),
+                                **kwargs)
+
+
+def test_query_experiment_leaves_lower_priority_nodes_queued(
+        tmp_path, monkeypatch):
+    queried = []
+    lock = threading.Lock()
+
+    def search(**query):
+        with lock:
+            queried.append(query["data_node"])
+        return ["{}.nc".format(query["data_node"])]
+
+    monkeypatch.setattr(esgf, "esgf_search", search)
+    downloader = make_downloader(tmp_path,
+                                 nodes=("a", "b", "c", "d"),
+                                 node_workers=1,
+                                 no_cache=True)
+
+    assert downloader._query_experiment(dict(), "historical") == ["a.nc"]
+    downloader._node_executor.shutdown(wait=True)
+    # Only the query that was running when "a" answered may have started
+    assert queried[0] == "a"
+    assert len(queried) <= 2
+
+
+class FlakySearch:
+    def __init__(self, failures=0):
+        self.calls = 0
+        self.failures = failures
+
+    def __call__(self, **query):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise requests.exceptions.ConnectionError("node unavailable")
+        return ["{}.nc".format(query["data_node"])]
+
+
+def test_query_node_cache_hit_and_miss(tmp_path, monkeypatch):
+    search = FlakySearch()
+    monkeypatch.setattr(esgf, "esgf_search", search)
+    downloader = make_downloader(tmp_path, nodes=("a",))
+
+    assert downloader._query_node(dict(experiment_id="historical"),
+                                  "a") == ["a.nc"]
+    assert downloader._query_node(dict(experiment_id="historical"),
+                                  "a") == ["a.nc"]
+    assert search.calls == 1
+
+    # A different query misses the cache
+    downloader._query_node(dict(experiment_id="ssp245"), "a")
+    assert search.calls == 2
+
+    # As does an expired entry
+    for cache_file in os.listdir(tmp_path / "cache"):
+        os.utime(tmp_path / "cache" / cache_file, (0, 0))
+    downloader._query_node(dict(experiment_id="historical"), "a")
+    assert search.calls == 3
+
+
+def test_query_node_retries_and_only_caches_success(tmp_path, monkeypatch):
+    monkeypatch.setattr(esgf.time, "sleep", lambda seconds: None)
+    search = FlakySearch(failures=3)
+    monkeypatch.setattr(esgf, "esgf_search", search)
+    downloader = make_downloader(tmp_path, nodes=("a",), query_retries=3)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        downloader._query_node(dict(experiment_id="historical"), "a")
+    assert search.calls == 3
+    assert os.listdir(tmp_path / "cache") == []
+
+    # The failure wasn't cached, so the next query goes back to the node,
+    # and a success after a retry is
+    search.failures = 4
+    assert downloader._query_node(dict(experiment_id="historical"),
+                                  "a") == ["a.nc"]
+    assert search.calls == 5
+    assert len(os.listdir(tmp_path / "cache")) == 1
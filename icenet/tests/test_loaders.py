@@ -0,0 +1,204 @@
+"""Tests for `icenet.data.loaders`"""
+
+import datetime as dt
+
+import dask
+import dask.array as da
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from icenet.data.loaders.dask import generate_sample, open_sample_datasets
+from icenet.data.process import IceNetPreProcessor
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_open_packed_variable_as_loader_dtype(tmp_path, dtype):
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(3, 4, 5)).astype(np.float32)
+    tas = xr.DataArray(data,
+                       dims=("time", "yc", "xc"),
+                       coords=dict(time=pd.date_range("2020-01-01",
+                                                      periods=3),
+                                   yc=np.arange(4.),
+                                   xc=np.arange(5.)),
+                       name="tas_anom")
+    encoding = IceNetPreProcessor.packed_encoding(tas)
+    path = str(tmp_path / "tas_anom.nc")
+    tas.to_netcdf(path, encoding={"tas_anom": encoding})
+
+    var_ds, trend_ds = open_sample_datasets((("tas_anom", path),), (),
+                                            (4, 5),
+                                            parallel=False,
+                                            dtype=dtype)
+
+    assert trend_ds is None
+    assert var_ds.tas_anom.dtype == dtype
+    assert var_ds.tas_anom.dims == ("yc", "xc", "time")
+    error = np.abs(var_ds.tas_anom.values - data.transpose(1, 2, 0))
+    assert error.max() <= encoding["scale_factor"] / 2 * (1 + 1e-3)
+
+
+def make_sample_dataset(dates, shape=(2, 2)):
+    rng = np.random.default_rng(3)
+    data_vars = {
+        name: (("yc", "xc", "time"),
+               rng.random((*shape, len(dates))).astype(np.float32))
+        for name in ("siconca_abs", "tas_anom")
+    }
+    return xr.Dataset(data_vars,
+                      coords=dict(yc=np.arange(float(shape[0])),
+                                  xc=np.arange(float(shape[1])),
+                                  time=dates)).chunk(dict(time=1))
+
+
+def test_generate_sample_with_gap_in_forecast_horizon():
+    dates = pd.date_range("2020-01-01", "2020-01-10").delete(6)
+    var_ds = make_sample_dataset(dates)
+    masks = da.ones((2, 2, 12), dtype=np.float32)
+
+    x, y, sample_weights = dask.compute(*generate_sample(
+        dt.date(2020, 1, 5), var_ds, dict(), None,
+        dict(siconca_abs=2, tas_anom=2), np.float32, True, [],
+        frozenset(), 4, 4, (2, 2), [], masks))
+
+    assert x.shape == (2, 2, 4)
+    assert y.shape == sample_weights.shape == (2, 2, 4, 1)
+    # 2020-01-07 is the third forecast day
+    assert np.isnan(y[:, :, 2]).all()
+    assert not np.isnan(np.delete(y, 2, axis=2)).any()
+    assert (sample_weights[:, :, 2] == 0).all()
+    np.testing.assert_allclose(np.delete(sample_weights, 2, axis=2),
+                               33928. / 4)
+
+
+def reference_sample(forecast_date, var_ds, var_files, trend_ds, channels,
+                     dtype, loss_weight_days, meta_channels, missing_dates,
+                     n_forecast_days, shape, trend_steps, masks):
+    """Per date and per lead time sample generation, as it was before the
+    loops were vectorised
+    """
+    forecast_dts = [
+        forecast_date + dt.timedelta(days=n) for n in range(n_forecast_days)
+    ]
+
+    y = np.zeros((*shape, n_forecast_days, 1), dtype=dtype)
+    sample_weights = np.zeros((*shape, n_forecast_days, 1), dtype=dtype)
+    y[:, :, :, 0] = var_ds.siconca_abs.sel(
+        time=[pd.Timestamp(d) for d in forecast_dts])
+
+    for leadtime_idx in range(n_forecast_days):
+        forecast_day = forecast_date + dt.timedelta(days=leadtime_idx)
+
+        if forecast_day in missing_dates:
+            sample_weight = np.zeros(shape, dtype)
+        else:
+            sample_weight = masks[..., forecast_day.month - 1].astype(dtype)
+            sample_weight[np.isnan(y[..., leadtime_idx, 0])] = 0
+
+            if loss_weight_days:
+                sample_weight *= 33928. / sample_weight.sum()
+
+        sample_weights[:, :, leadtime_idx, 0] = sample_weight
+
+    x = np.zeros((*shape, sum(channels.values())), dtype=dtype)
+    v1, v2 = 0, 0
+
+    for var_name, num_channels in channels.items():
+        if var_name in meta_channels:
+            continue
+
+        v2 += num_channels
+
+        if var_name.endswith("linear_trend"):
+            channel_ds = trend_ds
+            channel_dates = [
+                pd.Timestamp(forecast_date + dt.timedelta(days=int(n)))
+                for n in (trend_steps if type(trend_steps) == list else
+                          range(num_channels))
+            ]
+        else:
+            channel_ds = var_ds
+            channel_dates = [
+                pd.Timestamp(forecast_date - dt.timedelta(days=n))
+                for n in range(num_channels)
+            ]
+
+        channel_data = []
+        for cdate in channel_dates:
+            try:
+                channel_data.append(
+                    getattr(channel_ds, var_name).sel(time=cdate).values)
+            except KeyError:
+                channel_data.append(np.zeros(shape))
+
+        x[:, :, v1:v2] = np.array(channel_data).transpose([1, 2, 0])
+        v1 += num_channels
+
+    for var_name in meta_channels:
+        meta_da = xr.open_dataarray(var_files[var_name])
+
+        if var_name in ["sin", "cos"]:
+            ref_date = "2012-{}-{}".format(forecast_date.month,
+                                           forecast_date.day)
+            x[:, :, v1] = meta_da.sel(time=ref_date).values
+        else:
+            x[:, :, v1] = meta_da.values
+        v1 += 1
+
+    return x, y, sample_weights
+
+
+@pytest.mark.parametrize("trend_steps", [[1, 3], 2])
+@pytest.mark.parametrize("forecast_date",
+                         [dt.date(2020, 1, 4), dt.date(2020, 1, 8)])
+def test_generate_sample_matches_reference(tmp_path, forecast_date,
+                                           trend_steps):
+    shape = (2, 2)
+    # 2020-01-03 is missing from the source, so some lags are zero filled
+    var_ds = make_sample_dataset(
+        pd.date_range("2020-01-01", "2020-01-12").delete(2), shape)
+    var_ds.siconca_abs[0, 1, 7] = np.nan
+    trend_ds = xr.Dataset(
+        dict(siconca_linear_trend=(
+            ("yc", "xc", "time"),
+            np.random.default_rng(4).random((*shape, 20)))),
+        coords=dict(yc=var_ds.yc,
+                    xc=var_ds.xc,
+                    time=pd.date_range("2020-01-01", periods=20)))
+
+    sin_dates = pd.date_range("2012-01-01", "2012-12-31")
+    xr.DataArray(np.sin(np.arange(len(sin_dates)) / 366 * 2 * np.pi),
+                 dims=("time",),
+                 coords=dict(time=sin_dates),
+                 name="sin").to_netcdf(tmp_path / "sin.nc")
+    xr.DataArray(np.array([[0., 1.], [1., 1.]]),
+                 dims=("yc", "xc"),
+                 name="land").to_netcdf(tmp_path / "land.nc")
+    var_files = dict(sin=str(tmp_path / "sin.nc"),
+                     land=str(tmp_path / "land.nc"))
+
+    channels = dict(siconca_abs=3,
+                    tas_anom=2,
+                    siconca_linear_trend=2,
+                    sin=1,
+                    land=1)
+    meta_channels = ["sin", "land"]
+    missing_dates = frozenset([dt.date(2020, 1, 6)])
+    masks = np.random.default_rng(5).integers(
+        0, 2, size=(*shape, 12)).astype(np.float32)
+    masks[0, 0] = 1.
+
+    x, y, sample_weights = dask.compute(*generate_sample(
+        forecast_date, var_ds, var_files, trend_ds, channels, np.float32,
+        True, meta_channels, missing_dates, 3, sum(channels.values()), shape,
+        trend_steps, da.from_array(masks)))
+    expected = reference_sample(forecast_date, var_ds, var_files, trend_ds,
+                                channels, np.float32, True, meta_channels,
+                                missing_dates, 3, shape, trend_steps, masks)
+
+    for arr, expected_arr in zip((x, y, sample_weights), expected):
+        assert arr.shape == expected_arr.shape
+        assert arr.dtype == np.float32
+        np.testing.assert_allclose(arr, expected_arr, rtol=1e-6)
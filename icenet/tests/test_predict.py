@@ -0,0 +1,35 @@
+"""Tests for `icenet.process.predict`"""
+
+import numpy as np
+import pytest
+
+predict = pytest.importorskip("icenet.process.predict")
+
+
+@pytest.mark.parametrize("version", [(1, 0), (2, 0), (3, 0)])
+@pytest.mark.parametrize("fortran_order", [False, True])
+def test_load_npy_into_matches_np_load(tmp_path, version, fortran_order):
+    arr = np.random.default_rng(0).random((4, 5, 3)).astype(np.float32)
+    if fortran_order:
+        arr = np.asfortranarray(arr)
+    path = str(tmp_path / "2020_01_01.npy")
+
+    with open(path, "wb") as fh:
+        np.lib.format.write_array(fh, arr, version=version)
+
+    out = np.empty((4, 5, 3), dtype=np.float32)
+    result = predict.load_npy_into(path, out)
+
+    assert result is out
+    np.testing.assert_array_equal(result, np.load(path))
+
+
+def test_load_npy_into_converts_mismatched_dtype(tmp_path):
+    arr = np.random.default_rng(0).random((4, 5))
+    path = str(tmp_path / "2020_01_01.npy")
+    np.save(path, arr)
+
+    out = np.empty((4, 5), dtype=np.float32)
+    predict.load_npy_into(path, out)
+
+    np.testing.assert_array_equal(out, np.load(path).astype(np.float32))
@@ -0,0 +1,184 @@
+"""Tests for `icenet.data.process`"""
+
+import datetime as dt
+import os
+
+import dask.array
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from icenet.data.process import IceNetPreProcessor
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_mean_and_std_matches_nan_reductions(dtype):
+    rng = np.random.default_rng(0)
+    data = rng.normal(loc=5., scale=2., size=(100, 6, 7)).astype(dtype)
+    data[rng.random(data.shape) < 0.2] = np.nan
+    # Whole blocks with nothing valid in them are skipped
+    data[32:64] = np.nan
+    data[-3:] = np.nan
+
+    array = dask.array.from_array(data, chunks=(10, 3, 7))
+    mean, std = IceNetPreProcessor.mean_and_std(array)
+
+    assert mean.dtype == dtype
+    assert std.dtype == dtype
+    np.testing.assert_allclose(mean, np.nanmean(data.astype(np.float64)),
+                               rtol=1e-6)
+    np.testing.assert_allclose(std, np.nanstd(data.astype(np.float64)),
+                               rtol=1e-6)
+
+
+def test_mean_and_std_without_valid_values():
+    array = dask.array.from_array(
+        np.full((40, 2, 2), np.nan, dtype=np.float32), chunks=(8, 2, 2))
+
+    with pytest.raises(RuntimeError):
+        IceNetPreProcessor.mean_and_std(array)
+
+
+def make_daily_dataarray(dates):
+    rng = np.random.default_rng(1)
+    data = rng.normal(size=(len(dates), 3, 4)).astype(np.float32)
+    return xr.DataArray(data,
+                        dims=("time", "yc", "xc"),
+                        coords=dict(time=dates,
+                                    yc=np.arange(3.),
+                                    xc=np.arange(4.)),
+                        name="tas").chunk(dict(time=10))
+
+
+@pytest.mark.parametrize("clim_months", [[1, 2, 3], list(range(1, 13))])
+def test_subtract_climatology_matches_groupby(clim_months):
+    # Data with a gap over February, against a climatology holding at
+    # least every month in the data
+    dates = pd.date_range("2020-01-01", "2020-01-31").append(
+        pd.date_range("2020-03-01", "2020-03-20"))
+    da = make_daily_dataarray(dates)
+    climatology = xr.DataArray(
+        np.random.default_rng(2).normal(size=(len(clim_months), 3, 4)),
+        dims=("month", "yc", "xc"),
+        coords=dict(month=clim_months, yc=da.yc, xc=da.xc))
+
+    expected = da.groupby("time.month") - climatology
+    result = IceNetPreProcessor.subtract_climatology(da, climatology)
+
+    assert result.dims == da.dims
+    np.testing.assert_allclose(
+        result.values, expected.transpose(*da.dims).values, rtol=1e-6)
+
+
+def test_subtract_climatology_with_missing_months():
+    dates = pd.date_range("2020-01-15", "2020-02-15")
+    da = make_daily_dataarray(dates)
+    climatology = da.sel(time=slice("2020-01-15", "2020-01-31")).\
+        groupby("time.month").mean()
+
+    result = IceNetPreProcessor.subtract_climatology(da, climatology)
+
+    np.testing.assert_allclose(result.values,
+                               (da - climatology.mean()).values)
+
+
+def make_processor(path, train_dates, **kwargs):
+    return IceNetPreProcessor(["siconca"], [],
+                              "test",
+                              train_dates, [], [],
+                              north=True,
+                              south=False,
+                              path=str(path / "processed"),
+                              source_data=str(path / "data"),
+                              update_loader=False,
+                              identifier="osisaf",
+                              **kwargs)
+
+
+@pytest.mark.parametrize("train_dates", [
+    pd.date_range("2020-01-05", "2020-01-20"),
+    pd.date_range("2020-01-05", "2020-01-20")[::-1],
+    pd.date_range("2020-01-05", "2020-01-10").append(
+        pd.date_range("2020-01-15", "2020-01-20")),
+])
+def test_train_time_indexer_matches_date_selection(tmp_path, train_dates):
+    da = make_daily_dataarray(pd.date_range("2020-01-01", "2020-01-31"))
+    processor = make_processor(tmp_path, [d.date() for d in train_dates])
+
+    result = da.sel(time=processor._train_time_indexer(da))
+    expected = da.sel(time=processor._dates.train)
+
+    # Selection order is immaterial to the statistics computed from it
+    np.testing.assert_array_equal(result.sortby("time").values,
+                                  expected.sortby("time").values)
+
+
+def test_train_time_indexer_missing_source_dates(tmp_path):
+    da = make_daily_dataarray(
+        pd.date_range("2020-01-01", "2020-01-09").append(
+            pd.date_range("2020-01-11", "2020-01-31")))
+    processor = make_processor(
+        tmp_path,
+        [d.date() for d in pd.date_range("2020-01-05", "2020-01-20")])
+
+    with pytest.raises(KeyError):
+        da.sel(time=processor._dates.train)
+    with pytest.raises(KeyError):
+        da.sel(time=processor._train_time_indexer(da))
+
+
+@pytest.fixture
+def manifest_source(tmp_path):
+    source = tmp_path / "data" / "2020_01_01.nc"
+    source.parent.mkdir()
+    source.write_bytes(b"source")
+    return source
+
+
+def manifest_key_and_reuse(tmp_path,
+                           source,
+                           train_dates=(dt.date(2020, 1, 1),),
+                           **kwargs):
+    processor = make_processor(tmp_path, list(train_dates),
+                               linear_trends=("siconca",), **kwargs)
+    processor._var_files = dict(siconca=[str(source)])
+    key = processor._variable_manifest_key("siconca", "abs")
+    return key, processor._reuse_variable_outputs("siconca", "abs", key)
+
+
+@pytest.mark.parametrize("change", [
+    "mtime", "size", "dates", "refdir", "packing", "trend_steps"])
+def test_manifest_key_invalidation(tmp_path, manifest_source, change):
+    processor = make_processor(tmp_path, [dt.date(2020, 1, 1)],
+                               linear_trends=("siconca",))
+    processor._var_files = dict(siconca=[str(manifest_source)])
+    key = processor._variable_manifest_key("siconca", "abs")
+    output = os.path.join(processor.get_data_var_folder("siconca"),
+                          "siconca_abs.nc")
+    open(output, "w").close()
+    processor._write_variable_manifest("siconca", "abs", key, [output])
+
+    assert manifest_key_and_reuse(tmp_path, manifest_source) == (key, True)
+
+    kwargs = dict()
+
+    if change == "mtime":
+        stat = os.stat(manifest_source)
+        os.utime(manifest_source,
+                 ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    elif change == "size":
+        manifest_source.write_bytes(b"source data")
+    elif change == "dates":
+        kwargs["train_dates"] = (dt.date(2020, 1, 1), dt.date(2020, 1, 2))
+    elif change == "refdir":
+        kwargs["ref_procdir"] = str(tmp_path / "reference")
+    elif change == "packing":
+        kwargs["packed_vars"] = ("siconca",)
+    elif change == "trend_steps":
+        kwargs["linear_trend_steps"] = 3
+
+    new_key, reused = manifest_key_and_reuse(tmp_path, manifest_source,
+                                             **kwargs)
+    assert new_key != key
+    assert not reused
@@ -0,0 +1,59 @@
+"""Tests for `icenet.data.rotation`"""
+
+import numpy as np
+import pytest
+
+from icenet.data.rotation import rotate_vector_arrays
+
+
+def loop_rotate(uu, vv, angles):
+    """Reference rotation, one (time, y, x) slice at a time
+
+    :param uu:
+    :param vv:
+    :param angles: angles in (y, x) order
+    :return: tuple of rotated u and v masked arrays
+    """
+    u_r, v_r = [], []
+
+    for u, v in zip(uu, vv):
+        u_rot = np.ma.masked_invalid(u * np.cos(angles) - v * np.sin(angles))
+        v_rot = np.ma.masked_invalid(u * np.sin(angles) + v * np.cos(angles))
+        u_r.append(u_rot)
+        v_r.append(v_rot)
+    return np.ma.stack(u_r), np.ma.stack(v_r)
+
+
+@pytest.mark.parametrize("transpose_angles", [False, True])
+@pytest.mark.parametrize("transpose_xy", [False, True])
+def test_rotate_vector_arrays_matches_loop(transpose_xy, transpose_angles):
+    """Rotating in one go matches rotating per slice for either dimension
+    order of the data and of the angles on a non-square grid
+    """
+    rng = np.random.default_rng(42)
+    uu, vv = rng.normal(size=(2, 2, 3, 5))
+    angles = rng.uniform(-np.pi, np.pi, size=(3, 5))
+    angles[1, 2] = np.nan
+
+    u_expected, v_expected = loop_rotate(uu, vv, angles)
+
+    x_dim, y_dim = 2, 1
+    if transpose_xy:
+        uu, vv = uu.transpose(0, 2, 1), vv.transpose(0, 2, 1)
+        x_dim, y_dim = 1, 2
+    angles_x_dim, angles_y_dim = 1, 0
+    if transpose_angles:
+        angles = angles.T
+        angles_x_dim, angles_y_dim = 0, 1
+
+    u_r, v_r = rotate_vector_arrays(uu, vv, angles, x_dim, y_dim,
+                                    angles_x_dim, angles_y_dim)
+
+    if transpose_xy:
+        u_r, v_r = u_r.transpose(0, 2, 1), v_r.transpose(0, 2, 1)
+
+    for result, expected in ((u_r, u_expected), (v_r, v_expected)):
+        np.testing.assert_array_equal(np.ma.getmaskarray(result),
+                                      np.ma.getmaskarray(expected))
+        np.testing.assert_allclose(result.compressed(), expected.compressed(),
+                                   atol=1e-12)